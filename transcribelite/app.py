@@ -1,23 +1,30 @@
 from __future__ import annotations
 
 import argparse
+import importlib.util
+import json
+import logging
+import os
 import platform
+import shutil
+import struct
 import subprocess
 import sys
 import time
-import wave
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from transcribelite import __version__
 from transcribelite.config import AppConfig, init_config, load_config
-from transcribelite.pipeline.export import export_outputs
-from transcribelite.pipeline.ingest import prepare_wav
-from transcribelite.pipeline.stt_faster_whisper import transcribe_file
-from transcribelite.pipeline.summarize_ollama import check_ollama_health, summarize_text
 from transcribelite.utils.logging_setup import setup_logging
+from transcribelite.utils.wav import read_pcm_wav_header
 
-MEDIA_EXTS = {
+if TYPE_CHECKING:
+    from transcribelite.pipeline.export import ExportedTranscript
+
+MEDIA_EXTS = frozenset({
     ".mp3",
     ".wav",
     ".m4a",
@@ -29,32 +36,74 @@ MEDIA_EXTS = {
     ".avi",
     ".mov",
     ".webm",
-}
+})
+PROFILE_CHOICES = ("auto", "fast", "balanced", "quality")
+VALID_PROFILES = frozenset(PROFILE_CHOICES)
+DOCTOR_CACHE_TTL_S = 24 * 60 * 60
+
+_FFMPEG_OK_CACHE: Dict[Tuple[str, int], bool] = {}
+
+# Called with (stage, seconds) as each pipeline stage finishes.
+StageCallback = Callable[[str, float], None]
+
+
+@dataclass
+class MediaPlan:
+    media: Path
+    wav: Optional[Path] = None
+    ingest_s: float = 0.0
+    profile: Optional[str] = None
+    error: Optional[Exception] = None
+    stt_result: Optional[Dict[str, Any]] = None
+    stt_s: float = 0.0
+
+
+def _iter_media(root: Path, recursive: bool) -> Iterator[Path]:
+    try:
+        entries = os.scandir(root)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            name = entry.name
+            dot = name.rfind(".")
+            try:
+                if dot > 0 and name[dot:].lower() in MEDIA_EXTS and entry.is_file():
+                    yield Path(entry.path)
+                elif recursive and entry.is_dir(follow_symlinks=False):
+                    yield from _iter_media(Path(entry.path), recursive)
+            except OSError:
+                continue
 
 
 def _find_media(path: Path, recursive: bool) -> List[Path]:
-    iterator: Iterable[Path]
     if path.is_file():
         return [path]
-    if recursive:
-        iterator = path.rglob("*")
-    else:
-        iterator = path.glob("*")
-    return [p for p in iterator if p.is_file() and p.suffix.lower() in MEDIA_EXTS]
+    return list(_iter_media(path, recursive))
 
 
-def _apply_profile_preset(cfg: AppConfig, profile_name: str, set_profile_name: bool = True) -> None:
+def _apply_profile_preset(cfg: AppConfig, profile_name: str, set_profile_name: bool = True) -> bool:
     preset = cfg.profile_presets.get(profile_name)
     if preset is None:
         raise ValueError(f"Unknown profile: {profile_name}")
     if set_profile_name:
         cfg.profile_name = profile_name
-    cfg.stt.model_name = preset.model_name
-    cfg.stt.compute_type = preset.compute_type
-    cfg.stt.beam_size = preset.beam_size
+    wanted = (preset.model_name, preset.compute_type, preset.beam_size)
+    if (cfg.stt.model_name, cfg.stt.compute_type, cfg.stt.beam_size) == wanted:
+        return False
+    cfg.stt.model_name, cfg.stt.compute_type, cfg.stt.beam_size = wanted
+    return True
 
 
 def _wav_duration_seconds(wav_path: Path) -> float:
+    try:
+        header = read_pcm_wav_header(wav_path)
+    except (OSError, ValueError, struct.error):
+        header = None
+    if header is not None:
+        return header.duration_s
+    import wave
+
     with wave.open(str(wav_path), "rb") as wf:
         frames = wf.getnframes()
         rate = wf.getframerate() or 1
@@ -71,40 +120,71 @@ def _choose_auto_profile(cfg: AppConfig, duration_s: float) -> str:
     return auto_cfg.long_profile
 
 
-def _apply_overrides(cfg: AppConfig, args: argparse.Namespace) -> None:
-    if getattr(args, "profile", None):
-        requested = str(args.profile).strip().lower()
-        if requested == "auto":
-            cfg.profile_name = "auto"
-        else:
-            _apply_profile_preset(cfg, requested)
-    if getattr(args, "device", None):
-        cfg.stt.device = args.device
-    if getattr(args, "compute_type", None):
-        cfg.stt.compute_type = args.compute_type
-    if getattr(args, "model_name", None):
-        cfg.stt.model_name = args.model_name
-    if getattr(args, "summary", None) is False:
-        cfg.summarize.enabled = False
+def _plan_model_key(cfg: AppConfig, item: MediaPlan) -> Tuple[str, str]:
+    preset = cfg.profile_presets.get(item.profile or "")
+    if preset is None:
+        return "", ""
+    return preset.model_name, preset.compute_type
 
 
-def run_doctor(cfg: AppConfig) -> int:
-    print("== TranscribeLite Doctor ==")
-    ok = True
+def apply_profile_override(cfg: AppConfig, profile: str) -> None:
+    requested = str(profile).strip().lower()
+    if requested not in VALID_PROFILES:
+        raise ValueError(f"Unknown profile: {profile}")
+    if requested == "auto":
+        cfg.profile_name = "auto"
+    else:
+        _apply_profile_preset(cfg, requested)
 
-    print(f"[python] {platform.python_version()} ({sys.executable})")
 
-    ffmpeg_ok = False
+def _apply_overrides(cfg: AppConfig, args: argparse.Namespace) -> None:
+    values = vars(args)
+    profile = values.get("profile")
+    if profile:
+        apply_profile_override(cfg, profile)
+    device = values.get("device")
+    if device:
+        cfg.stt.device = device
+    compute_type = values.get("compute_type")
+    if compute_type:
+        cfg.stt.compute_type = compute_type
+    model_name = values.get("model_name")
+    if model_name:
+        cfg.stt.model_name = model_name
+    if values.get("summary") is False:
+        cfg.summarize.enabled = False
+
+
+def _module_fingerprint(name: str) -> str:
     try:
-        result = subprocess.run(
-            [cfg.paths.ffmpeg_path, "-version"], capture_output=True, text=True, timeout=15
-        )
-        ffmpeg_ok = result.returncode == 0
-    except Exception:  # noqa: BLE001
-        ffmpeg_ok = False
-    print(f"[ffmpeg] {'OK' if ffmpeg_ok else 'FAIL'} ({cfg.paths.ffmpeg_path})")
-    ok = ok and ffmpeg_ok
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        return ""
+    if spec is None or not spec.origin:
+        return ""
+    try:
+        return f"{spec.origin}|{os.stat(spec.origin).st_mtime_ns}"
+    except OSError:
+        return spec.origin
 
+
+def _doctor_fingerprint() -> Dict[str, str]:
+    nvidia_smi = shutil.which("nvidia-smi") or ""
+    if nvidia_smi:
+        try:
+            nvidia_smi = f"{nvidia_smi}|{os.stat(nvidia_smi).st_mtime_ns}"
+        except OSError:
+            pass
+    return {
+        "python": sys.version,
+        "executable": sys.executable,
+        "torch": _module_fingerprint("torch"),
+        "faster_whisper": _module_fingerprint("faster_whisper"),
+        "nvidia_smi": nvidia_smi,
+    }
+
+
+def _probe_env() -> Dict[str, bool]:
     torch_ok = False
     cuda_ok = False
     try:
@@ -114,8 +194,6 @@ def run_doctor(cfg: AppConfig) -> int:
         cuda_ok = bool(torch.cuda.is_available())
     except Exception:  # noqa: BLE001
         pass
-    print(f"[torch] {'OK' if torch_ok else 'FAIL'}")
-    print(f"[torch.cuda] {'OK' if cuda_ok else 'FAIL'}")
 
     fw_ok = False
     try:
@@ -124,15 +202,242 @@ def run_doctor(cfg: AppConfig) -> int:
         fw_ok = True
     except Exception:  # noqa: BLE001
         fw_ok = False
-    print(f"[faster-whisper] {'OK' if fw_ok else 'FAIL'}")
-    ok = ok and fw_ok
+    return {"torch_ok": torch_ok, "cuda_ok": cuda_ok, "fw_ok": fw_ok}
+
+
+def _probe_env_cached(cfg: AppConfig, force: bool = False) -> Dict[str, bool]:
+    cache_path = cfg.paths.cache_dir / "doctor.json"
+    fingerprint = _doctor_fingerprint()
+    if not force:
+        try:
+            cached = json.loads(cache_path.read_text(encoding="utf-8"))
+            fresh = time.time() - float(cached.get("checked_at", 0)) < DOCTOR_CACHE_TTL_S
+            if fresh and cached.get("fingerprint") == fingerprint:
+                return {key: bool(cached["probe"][key]) for key in ("torch_ok", "cuda_ok", "fw_ok")}
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    probe = _probe_env()
+    try:
+        cache_path.write_text(
+            json.dumps({"checked_at": time.time(), "fingerprint": fingerprint, "probe": probe}),
+            encoding="utf-8",
+        )
+    except OSError:
+        pass
+    return probe
+
+
+def _check_ffmpeg(ffmpeg_path: str) -> bool:
+    resolved = shutil.which(ffmpeg_path) or ffmpeg_path
+    try:
+        key = (resolved, os.stat(resolved).st_mtime_ns)
+    except OSError:
+        return False
+    cached = _FFMPEG_OK_CACHE.get(key)
+    if cached is not None:
+        return cached
+    try:
+        result = subprocess.run(
+            [resolved, "-version"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=5,
+        )
+        ok = result.returncode == 0
+    except Exception:  # noqa: BLE001
+        ok = False
+    _FFMPEG_OK_CACHE[key] = ok
+    return ok
+
+
+def run_doctor(cfg: AppConfig, force: bool = False) -> int:
+    print("== TranscribeLite Doctor ==")
+    ok = True
+
+    print(f"[python] {platform.python_version()} ({sys.executable})")
+
+    ffmpeg_ok = _check_ffmpeg(cfg.paths.ffmpeg_path)
+    print(f"[ffmpeg] {'OK' if ffmpeg_ok else 'FAIL'} ({cfg.paths.ffmpeg_path})")
+    ok = ok and ffmpeg_ok
+
+    probe = _probe_env_cached(cfg, force=force)
+    print(f"[torch] {'OK' if probe['torch_ok'] else 'FAIL'}")
+    print(f"[torch.cuda] {'OK' if probe['cuda_ok'] else 'FAIL'}")
+    print(f"[faster-whisper] {'OK' if probe['fw_ok'] else 'FAIL'}")
+    ok = ok and probe["fw_ok"]
+
+    from transcribelite.pipeline.summarize_ollama import check_ollama_health
 
     ollama_ok, reason = check_ollama_health(cfg)
     print(f"[ollama] {'OK' if ollama_ok else 'WARN'} ({reason})")
     return 0 if ok else 1
 
 
+def _apply_plan_stt(cfg: AppConfig, item: MediaPlan, base_stt: Tuple[str, str, int]) -> bool:
+    if item.profile:
+        return _apply_profile_preset(cfg, item.profile, set_profile_name=False)
+    if (cfg.stt.model_name, cfg.stt.compute_type, cfg.stt.beam_size) == base_stt:
+        return False
+    cfg.stt.model_name, cfg.stt.compute_type, cfg.stt.beam_size = base_stt
+    return True
+
+
+def _print_stage(stage: str, seconds: float) -> None:
+    print(f"  {stage}: {seconds:.1f}s")
+
+
+def _transcribe_planned(
+    cfg: AppConfig,
+    item: MediaPlan,
+    base_stt: Tuple[str, str, int],
+    on_stage: Optional[StageCallback] = None,
+) -> MediaPlan:
+    # Pipeline imports live at call sites so `config`, `doctor` and `--version` start fast.
+    from transcribelite.pipeline.ingest import prepare_wav
+    from transcribelite.pipeline.stt_faster_whisper import transcribe_file
+
+    perf = time.perf_counter
+    if item.error is not None:
+        raise item.error
+    if item.wav is None:
+        t_ingest = perf()
+        item.wav = prepare_wav(item.media, cfg.paths)
+        item.ingest_s = perf() - t_ingest
+    if on_stage is not None:
+        on_stage("ingest", item.ingest_s)
+    if _apply_plan_stt(cfg, item, base_stt):
+        logging.getLogger("transcribelite").debug(
+            "STT settings for %s: %s/%s beam=%s",
+            item.media.name,
+            cfg.stt.model_name,
+            cfg.stt.compute_type,
+            cfg.stt.beam_size,
+        )
+
+    t_stt = perf()
+    item.stt_result = transcribe_file(item.wav, cfg)
+    item.stt_s = perf() - t_stt
+    if on_stage is not None:
+        on_stage("stt", item.stt_s)
+    return item
+
+
+def _finish_planned(
+    cfg: AppConfig,
+    item: MediaPlan,
+    logger: logging.Logger,
+    on_stage: StageCallback = _print_stage,
+) -> ExportedTranscript:
+    from transcribelite.pipeline.export import export_transcript
+    from transcribelite.pipeline.summarize_ollama import summarize_text
+
+    perf = time.perf_counter
+    stt_result = item.stt_result or {}
+    used_device = stt_result["meta"].get("device")
+    if cfg.stt.device.lower() == "cuda" and used_device != "cuda":
+        logger.warning("CUDA requested but unavailable; switched to CPU/int8")
+
+    summary = None
+    summary_error = None
+    if cfg.summarize.enabled:
+        t_sum = perf()
+        summary, summary_error = summarize_text(stt_result["text"], cfg)
+        on_stage("summarize", perf() - t_sum)
+        if summary_error:
+            logger.warning("Summary skipped for %s: %s", item.media.name, summary_error)
+    else:
+        summary_error = "summary disabled in config"
+
+    t_export = perf()
+    exported = export_transcript(
+        cfg=cfg,
+        source_path=item.media,
+        transcript_text=stt_result["text"],
+        segments=stt_result["segments"],
+        stt_meta=stt_result["meta"],
+        summary=summary,
+        summary_error=summary_error,
+    )
+    on_stage("export", perf() - t_export)
+    return exported
+
+
+def transcribe_media(
+    cfg: AppConfig,
+    media: Path,
+    on_stage: Optional[StageCallback] = None,
+) -> ExportedTranscript:
+    # Single-file pipeline for long-lived hosts (the web UI): runs in the caller's process, so
+    # Whisper models stay in the get_model cache between jobs. Errors propagate to the caller.
+    from transcribelite.pipeline.ingest import prepare_wav
+
+    logger = logging.getLogger("transcribelite")
+    report = on_stage or (lambda stage, seconds: None)
+    base_stt = (cfg.stt.model_name, cfg.stt.compute_type, cfg.stt.beam_size)
+    item = MediaPlan(media=media)
+    if cfg.profile_name == "auto":
+        t_ingest = time.perf_counter()
+        item.wav = prepare_wav(media, cfg.paths)
+        item.ingest_s = time.perf_counter() - t_ingest
+        duration_s = _wav_duration_seconds(item.wav)
+        item.profile = _choose_auto_profile(cfg, duration_s)
+        logger.info("Auto profile selected for %s: %s (duration %.1fs)", media.name, item.profile, duration_s)
+    _transcribe_planned(cfg, item, base_stt, on_stage=report)
+    return _finish_planned(cfg, item, logger, on_stage=report)
+
+
+def _process_planned(
+    cfg: AppConfig,
+    item: MediaPlan,
+    base_stt: Tuple[str, str, int],
+    logger: logging.Logger,
+) -> None:
+    perf = time.perf_counter
+    t0 = perf()
+    try:
+        _transcribe_planned(cfg, item, base_stt, on_stage=_print_stage)
+        out_dir = _finish_planned(cfg, item, logger).out_dir
+        print(f"  done: {perf() - t0:.1f}s -> {out_dir}")
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Failed processing %s", item.media)
+        print(f"  failed: {exc}")
+
+
+def _run_transcribe_pool(
+    cfg: AppConfig,
+    plan: List[MediaPlan],
+    base_stt: Tuple[str, str, int],
+    workers: int,
+    logger: logging.Logger,
+) -> int:
+    # CPU-only: one model per worker process; summarize/export stay serial in this process.
+    perf = time.perf_counter
+    logger.info("Transcribing with %s worker process(es)", workers)
+    with ProcessPoolExecutor(max_workers=min(workers, len(plan))) as pool:
+        futures = {pool.submit(_transcribe_planned, cfg, item, base_stt): item for item in plan}
+        for idx, future in enumerate(as_completed(futures), start=1):
+            item = futures[future]
+            print(f"[{idx}/{len(plan)}] Processing: {item.media.name}")
+            t0 = perf()
+            try:
+                item = future.result()
+                _print_stage("ingest", item.ingest_s)
+                _print_stage("stt", item.stt_s)
+                _apply_plan_stt(cfg, item, base_stt)
+                out_dir = _finish_planned(cfg, item, logger).out_dir
+                total_s = item.ingest_s + item.stt_s + perf() - t0
+                print(f"  done: {total_s:.1f}s -> {out_dir}")
+            except Exception as exc:  # noqa: BLE001
+                logger.exception("Failed processing %s", item.media)
+                print(f"  failed: {exc}")
+    return 0
+
+
 def run_transcribe(args: argparse.Namespace) -> int:
+    from transcribelite.pipeline.ingest import batch_prepare_wavs, prepare_wav
+
+    perf = time.perf_counter
     cfg = load_config(args.config, init_if_missing=True)
     _apply_overrides(cfg, args)
     logger = setup_logging(cfg.paths.logs_dir / "transcribelite.log")
@@ -146,67 +451,42 @@ def run_transcribe(args: argparse.Namespace) -> int:
         return 1
 
     logger.info("Found %s media file(s)", len(files))
-    base_model_name = cfg.stt.model_name
-    base_compute_type = cfg.stt.compute_type
-    base_beam_size = cfg.stt.beam_size
-    cli_has_stt_override = bool(args.model_name or args.compute_type)
-    auto_mode = cfg.profile_name == "auto"
 
-    for idx, media in enumerate(files, start=1):
-        print(f"[{idx}/{len(files)}] Processing: {media.name}")
-        t0 = time.perf_counter()
-        try:
-            t_ingest = time.perf_counter()
-            wav = prepare_wav(media, cfg.paths)
-            print(f"  ingest: {time.perf_counter() - t_ingest:.1f}s")
-            if auto_mode and not cli_has_stt_override:
-                duration_s = _wav_duration_seconds(wav)
-                selected = _choose_auto_profile(cfg, duration_s)
-                _apply_profile_preset(cfg, selected, set_profile_name=False)
+    cli_has_stt_override = bool(args.model_name or args.compute_type)
+    auto_mode = cfg.profile_name == "auto" and not cli_has_stt_override
+    base_stt = (cfg.stt.model_name, cfg.stt.compute_type, cfg.stt.beam_size)
+    workers = max(1, int(getattr(args, "workers", None) or 1))
+    use_pool = workers > 1 and cfg.stt.device.lower() == "cpu"
+
+    plan = [MediaPlan(media=media) for media in files]
+    if auto_mode:
+        # Ingest up front so files sharing a model run back to back on one cached WhisperModel.
+        t_batch = perf()
+        batch_prepare_wavs(files, cfg.paths)
+        batch_share_s = (perf() - t_batch) / len(plan)
+        for item in plan:
+            t_ingest = perf()
+            try:
+                item.wav = prepare_wav(item.media, cfg.paths)
+                item.ingest_s = batch_share_s + perf() - t_ingest
+                duration_s = _wav_duration_seconds(item.wav)
+                item.profile = _choose_auto_profile(cfg, duration_s)
                 logger.info(
                     "Auto profile selected for %s: %s (duration %.1fs)",
-                    media.name,
-                    selected,
+                    item.media.name,
+                    item.profile,
                     duration_s,
                 )
-            else:
-                cfg.stt.model_name = base_model_name
-                cfg.stt.compute_type = base_compute_type
-                cfg.stt.beam_size = base_beam_size
-
-            t_stt = time.perf_counter()
-            stt_result = transcribe_file(wav, cfg)
-            print(f"  stt: {time.perf_counter() - t_stt:.1f}s")
-            used_device = stt_result["meta"].get("device")
-            if cfg.stt.device.lower() == "cuda" and used_device != "cuda":
-                logger.warning("CUDA requested but unavailable; switched to CPU/int8")
-
-            summary = None
-            summary_error = None
-            if cfg.summarize.enabled:
-                t_sum = time.perf_counter()
-                summary, summary_error = summarize_text(stt_result["text"], cfg)
-                print(f"  summarize: {time.perf_counter() - t_sum:.1f}s")
-                if summary_error:
-                    logger.warning("Summary skipped for %s: %s", media.name, summary_error)
-            else:
-                summary_error = "summary disabled in config"
-
-            t_export = time.perf_counter()
-            out_dir = export_outputs(
-                cfg=cfg,
-                source_path=media,
-                transcript_text=stt_result["text"],
-                segments=stt_result["segments"],
-                stt_meta=stt_result["meta"],
-                summary=summary,
-                summary_error=summary_error,
-            )
-            print(f"  export: {time.perf_counter() - t_export:.1f}s")
-            print(f"  done: {time.perf_counter() - t0:.1f}s -> {out_dir}")
-        except Exception as exc:  # noqa: BLE001
-            logger.exception("Failed processing %s", media)
-            print(f"  failed: {exc}")
+            except Exception as exc:  # noqa: BLE001
+                item.error = exc
+        plan.sort(key=lambda item: _plan_model_key(cfg, item))
+
+    if use_pool and len(plan) > 1:
+        return _run_transcribe_pool(cfg, plan, base_stt, workers, logger)
+
+    for idx, item in enumerate(plan, start=1):
+        print(f"[{idx}/{len(plan)}] Processing: {item.media.name}")
+        _process_planned(cfg, item, base_stt, logger)
     return 0
 
 
@@ -222,18 +502,27 @@ def build_parser() -> argparse.ArgumentParser:
     p_transcribe.add_argument("--recursive", action="store_true", help="Scan folder recursively")
     p_transcribe.add_argument(
         "--profile",
-        choices=["auto", "fast", "balanced", "quality"],
+        choices=PROFILE_CHOICES,
         help="Use preset for speed/quality (overrides STT settings for this run)",
     )
     p_transcribe.add_argument("--device", choices=["cuda", "cpu"], help="Override STT device")
     p_transcribe.add_argument("--compute-type", help="Override STT compute_type")
     p_transcribe.add_argument("--model-name", help="Override STT model_name")
+    p_transcribe.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Parallel worker processes for CPU transcription (GPU runs stay serial)",
+    )
     p_transcribe.add_argument(
         "--no-summary", dest="summary", action="store_false", help="Disable summarization"
     )
     p_transcribe.set_defaults(summary=None)
 
-    sub.add_parser("doctor", help="Run environment checks")
+    p_doctor = sub.add_parser("doctor", help="Run environment checks")
+    p_doctor.add_argument(
+        "--force", action="store_true", help="Ignore cached torch/faster-whisper probe results"
+    )
 
     p_config = sub.add_parser("config", help="Config actions")
     p_config.add_argument("--init", action="store_true", help="Create config.ini if missing")
@@ -258,7 +547,7 @@ def main(argv: List[str] | None = None) -> int:
     cfg = load_config(args.config, init_if_missing=True)
 
     if args.command == "doctor":
-        return run_doctor(cfg)
+        return run_doctor(cfg, force=args.force)
     if args.command == "transcribe":
         return run_transcribe(args)
     parser.error("Unknown command")
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import copy
 from configparser import ConfigParser
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 
 from transcribelite.utils.paths import ensure_dirs, resolve_path
 
@@ -22,21 +24,22 @@ DEFAULT_CONFIG = {
         "engine": "faster_whisper",
         "model_name": "large-v3",
         "device": "cuda",
-        "compute_type": "float16",
+        "compute_type": "auto",
         "beam_size": "5",
         "vad_filter": "true",
         "language": "auto",
         "task": "transcribe",
+        "model_cache_size": "2",
     },
     "profile": {"active": "balanced"},
     "profile_fast": {
         "model_name": "small",
-        "compute_type": "int8_float32",
+        "compute_type": "auto",
         "beam_size": "1",
     },
     "profile_balanced": {
         "model_name": "medium",
-        "compute_type": "int8_float32",
+        "compute_type": "auto",
         "beam_size": "4",
     },
     "profile_quality": {
@@ -63,6 +66,7 @@ DEFAULT_CONFIG = {
         "timeout_s": "120",
         "max_chars": "18000",
         "stream": "false",
+        "concurrency": "1",
     },
     "export": {
         "save_txt": "true",
@@ -82,6 +86,11 @@ DEFAULT_CONFIG = {
     },
 }
 
+_PROFILE_STT_KEYS = frozenset(
+    {"model_name", "compute_type", "beam_size", "device", "language", "task", "vad_filter"}
+)
+_SUMMARIZE_PREFIX = "summarize_"
+
 
 @dataclass
 class PathsConfig:
@@ -104,6 +113,7 @@ class SttConfig:
     vad_filter: bool
     language: str
     task: str
+    model_cache_size: int
 
 
 @dataclass
@@ -119,6 +129,7 @@ class SummarizeConfig:
     timeout_s: int
     max_chars: int
     stream: bool
+    concurrency: int
 
 
 @dataclass
@@ -170,8 +181,7 @@ class DictationConfig:
     auto_save: bool
 
 
-def _apply_profile_overrides(parser: ConfigParser) -> str:
-    active = parser.get("profile", "active", fallback="custom").strip().lower()
+def _apply_profile_overrides(parser: ConfigParser, active: str) -> str:
     if active in ("", "custom", "auto"):
         return "custom"
 
@@ -179,11 +189,12 @@ def _apply_profile_overrides(parser: ConfigParser) -> str:
     if not parser.has_section(section):
         return active
 
+    prefix_len = len(_SUMMARIZE_PREFIX)
     for key, value in parser.items(section):
-        if key in ("model_name", "compute_type", "beam_size", "device", "language", "task", "vad_filter"):
+        if key in _PROFILE_STT_KEYS:
             parser.set("stt", key, value)
-        elif key.startswith("summarize_"):
-            parser.set("summarize", key.removeprefix("summarize_"), value)
+        elif key[:prefix_len] == _SUMMARIZE_PREFIX:
+            parser.set("summarize", key[prefix_len:], value)
     return active
 
 
@@ -213,6 +224,35 @@ def _build_default_parser() -> ConfigParser:
     return parser
 
 
+def _parse_simple_ini(text: str) -> Optional[Dict[str, Dict[str, str]]]:
+    # Fast path for flat `key = value` files; returns None (use ConfigParser) for anything
+    # that needs its full semantics: interpolation, continuation lines, duplicates, etc.
+    if "%" in text:
+        return None
+    sections: Dict[str, Dict[str, str]] = {}
+    current: Optional[Dict[str, str]] = None
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line or line[0] in "#;":
+            continue
+        if raw_line[0] in " \t":
+            return None
+        if line[0] == "[" and line[-1] == "]":
+            name = line[1:-1]
+            if name in sections:
+                return None
+            current = sections[name] = {}
+            continue
+        key, sep, value = line.partition("=")
+        if not sep or ":" in key or current is None:
+            return None
+        key = key.strip().lower()
+        if not key or key in current:
+            return None
+        current[key] = value.strip()
+    return sections
+
+
 def init_config(config_path: Path) -> None:
     config_path.parent.mkdir(parents=True, exist_ok=True)
     parser = _build_default_parser()
@@ -227,10 +267,25 @@ def load_config(config_path: str | None = None, init_if_missing: bool = True) ->
             raise FileNotFoundError(f"Config not found: {cfg_path}")
         init_config(cfg_path)
 
+    # Callers mutate the returned config (profiles, CLI overrides), so hand out a private copy.
+    cfg = copy.deepcopy(_load_config_cached(cfg_path, cfg_path.stat().st_mtime_ns))
+    # Outside the cache: a directory removed while the web server runs is recreated on next use.
+    paths = cfg.paths
+    ensure_dirs([paths.models_dir, paths.cache_dir, paths.output_dir, paths.logs_dir, paths.wheels_dir])
+    return cfg
+
+
+@lru_cache(maxsize=4)
+def _load_config_cached(cfg_path: Path, mtime_ns: int) -> AppConfig:
     parser = _build_default_parser()
-    parser.read(cfg_path, encoding="utf-8-sig")
+    text = cfg_path.read_text(encoding="utf-8-sig")
+    sections = _parse_simple_ini(text)
+    if sections is None:
+        parser.read_string(text, source=str(cfg_path))
+    else:
+        parser.read_dict(sections, source=str(cfg_path))
     requested_profile = parser.get("profile", "active", fallback="custom").strip().lower()
-    active_profile = _apply_profile_overrides(parser)
+    active_profile = _apply_profile_overrides(parser, requested_profile)
 
     cfg_dir = cfg_path.parent
     base_dir = resolve_path(cfg_dir, parser.get("paths", "base_dir"))
@@ -243,10 +298,6 @@ def load_config(config_path: str | None = None, init_if_missing: bool = True) ->
         wheels_dir=resolve_path(base_dir, parser.get("paths", "wheels_dir")),
         ffmpeg_path=parser.get("paths", "ffmpeg_path"),
     )
-    ensure_dirs(
-        [paths.models_dir, paths.cache_dir, paths.output_dir, paths.logs_dir, paths.wheels_dir]
-    )
-
     summarize_prompt = resolve_path(base_dir, parser.get("summarize", "prompt_template"))
     ollama_mode = parser.get("summarize", "ollama_mode", fallback="auto").strip().lower()
     if ollama_mode not in {"local", "cloud", "auto"}:
@@ -275,6 +326,7 @@ def load_config(config_path: str | None = None, init_if_missing: bool = True) ->
         timeout_s=parser.getint("summarize", "timeout_s"),
         max_chars=parser.getint("summarize", "max_chars"),
         stream=parser.getboolean("summarize", "stream"),
+        concurrency=max(1, parser.getint("summarize", "concurrency")),
     )
     profile_presets = _load_profile_presets(parser)
     profile_auto = ProfileAutoConfig(
@@ -300,6 +352,7 @@ def load_config(config_path: str | None = None, init_if_missing: bool = True) ->
             vad_filter=parser.getboolean("stt", "vad_filter"),
             language=parser.get("stt", "language"),
             task=parser.get("stt", "task"),
+            model_cache_size=max(1, parser.getint("stt", "model_cache_size")),
         ),
         profile_presets=profile_presets,
         profile_auto=profile_auto,
@@ -4,7 +4,6 @@ import argparse
 import threading
 import time
 from dataclasses import dataclass
-from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
 
@@ -40,12 +39,14 @@ def _normalize_hotkey(hotkey: str) -> str:
 @dataclass
 class RecorderState:
     stream: Optional[object]
-    chunks: List["np.ndarray"]
+    buffer: Optional["np.ndarray"]
+    pcm16: Optional["np.ndarray"]
+    write_pos: int
     sample_rate: int
     channels: int
     started_at: float
-    recording: bool
-    busy: bool
+    recording: threading.Event
+    busy: threading.Event
 
 
 class HotkeyDictation:
@@ -54,36 +55,71 @@ class HotkeyDictation:
         self.logger = setup_logging(cfg.paths.logs_dir / "transcribelite-hotkey.log")
         self.state = RecorderState(
             stream=None,
-            chunks=[],
+            buffer=None,
+            pcm16=None,
+            write_pos=0,
             sample_rate=16000,
             channels=1,
             started_at=0.0,
-            recording=False,
-            busy=False,
+            recording=threading.Event(),
+            busy=threading.Event(),
         )
         self.lock = threading.Lock()
+        self.dictation_dir = cfg.paths.cache_dir / "dictation"
+        self.dictation_dir.mkdir(parents=True, exist_ok=True)
+
+    def _ensure_buffer(self) -> "np.ndarray":
+        import numpy as np  # type: ignore
+
+        max_seconds = max(5, int(self.cfg.dictation.max_seconds))
+        shape = (max_seconds * self.state.sample_rate, self.state.channels)
+        buffer = self.state.buffer
+        if buffer is None or buffer.shape != shape:
+            # Allocated once and reused across recordings; max_seconds caps its size.
+            buffer = np.empty(shape, dtype=np.float32)
+            self.state.buffer = buffer
+            self.state.pcm16 = np.empty(shape, dtype=np.int16)
+        return buffer
+
+    def _to_pcm16(self, frames: int) -> "np.ndarray":
+        import numpy as np  # type: ignore
+
+        # One vectorized float32 -> int16 pass so soundfile writes PCM_16 without converting.
+        view = self.state.buffer[:frames]
+        np.clip(view, -1.0, 1.0, out=view)
+        np.multiply(view, 32767.0, out=view)
+        # Round like libsndfile's float -> PCM_16 conversion (lrint); a bare cast would truncate.
+        np.rint(view, out=view)
+        pcm = self.state.pcm16[:frames]
+        pcm[...] = view
+        return pcm
 
     def _start_recording(self) -> None:
         import sounddevice as sd  # type: ignore
 
         with self.lock:
-            if self.state.recording or self.state.busy:
+            if self.state.recording.is_set() or self.state.busy.is_set():
                 return
-            self.state.chunks = []
+            buffer = self._ensure_buffer()
+            self.state.write_pos = 0
             self.state.started_at = time.time()
-            self.state.recording = True
+            self.state.recording.set()
 
-        max_seconds = max(5, int(self.cfg.dictation.max_seconds))
+        capacity = buffer.shape[0]
+        recording = self.state.recording
 
+        # Single producer (audio thread): no lock here, only an Event check and an int cursor.
         def callback(indata, frames, callback_time, status):  # noqa: ANN001
             if status:
                 self.logger.warning("Mic status: %s", status)
-            with self.lock:
-                if not self.state.recording:
-                    return
-                self.state.chunks.append(indata.copy())
-                if (time.time() - self.state.started_at) >= max_seconds:
-                    self.state.recording = False
+            if not recording.is_set():
+                return
+            start = self.state.write_pos
+            end = min(capacity, start + len(indata))
+            buffer[start:end] = indata[: end - start]
+            self.state.write_pos = end
+            if end >= capacity:
+                recording.clear()
 
         stream = sd.InputStream(
             samplerate=self.state.sample_rate,
@@ -98,18 +134,15 @@ class HotkeyDictation:
         print("HOTKEY: recording started")
 
     def _stop_recording(self) -> Optional[Path]:
-        import numpy as np  # type: ignore
         import soundfile as sf  # type: ignore
 
         with self.lock:
-            if self.state.busy:
+            if self.state.busy.is_set():
                 return None
-            self.state.busy = True
-            self.state.recording = False
+            self.state.busy.set()
+            self.state.recording.clear()
             stream = self.state.stream
             self.state.stream = None
-            chunks = list(self.state.chunks)
-            self.state.chunks = []
 
         try:
             if stream is not None:
@@ -118,19 +151,18 @@ class HotkeyDictation:
         except Exception:
             pass
 
-        if not chunks:
-            with self.lock:
-                self.state.busy = False
+        frames = self.state.write_pos
+        self.state.write_pos = 0
+        if not frames or self.state.buffer is None:
+            self.state.busy.clear()
             print("HOTKEY: no audio captured")
             return None
 
-        audio = np.concatenate(chunks, axis=0)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        wav_path = self.cfg.paths.cache_dir / "dictation" / f"hotkey_{timestamp}.wav"
-        wav_path.parent.mkdir(parents=True, exist_ok=True)
+        audio = self._to_pcm16(frames)
+        timestamp = time.strftime("%Y%m%d_%H%M%S", time.localtime())
+        wav_path = self.dictation_dir / f"hotkey_{timestamp}.wav"
         sf.write(str(wav_path), audio, self.state.sample_rate, subtype="PCM_16")
-        with self.lock:
-            self.state.busy = False
+        self.state.busy.clear()
         return wav_path
 
     def _process_file(self, wav_path: Path) -> None:
@@ -166,9 +198,7 @@ class HotkeyDictation:
                 pass
 
     def toggle(self) -> None:
-        with self.lock:
-            recording = self.state.recording
-        if not recording:
+        if not self.state.recording.is_set():
             self._start_recording()
             return
 
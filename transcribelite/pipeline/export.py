@@ -1,31 +1,108 @@
 from __future__ import annotations
 
 import json
+import os
 import re
-from datetime import datetime
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional
 
+try:
+    # Optional: serializes large segment lists much faster and emits UTF-8 bytes directly.
+    import orjson
+except ImportError:
+    orjson = None
+
 from transcribelite import __version__
 from transcribelite.config import AppConfig
 from transcribelite.pipeline.summarize_ollama import check_ollama_health, generate_text
+from transcribelite.utils.llm_cache import llm_cache_get, llm_cache_key, llm_cache_put
+
+_UNTITLED = "Без названия"
+
+# Compiled once at import: these run on every export and title request.
+_ACTION_RE = re.compile(r"##\s*Action items\s*(.+?)(?:\n##\s+|\Z)", re.I | re.S)
+_DECISIONS_RE = re.compile(r"##\s*Decisions\s*(.+?)(?:\n##\s+|\Z)", re.I | re.S)
+_RISKS_RE = re.compile(r"##\s*Risks.*?\s*(.+?)(?:\n##\s+|\Z)", re.I | re.S)
+_TAGS_RE = re.compile(r"##\s*Tags\s*(.+?)(?:\n##\s+|\Z)", re.I | re.S)
+_TRAIL_PUNCT_RE = re.compile(r"[.?!,:;]+$")
+_HEADING_RE = re.compile(r"(?m)^\s*#+\s*")
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+# \w keeps Unicode letters/digits (Cyrillic file names stay readable).
+_UNSAFE_NAME_CHAR_RE = re.compile(r"[^\w.-]")
 
 
 def _safe_name(name: str) -> str:
-    allowed = []
-    for ch in name:
-        if ch.isalnum() or ch in ("-", "_", "."):
-            allowed.append(ch)
-        else:
-            allowed.append("_")
-    return "".join(allowed).strip("_") or "input"
+    return _UNSAFE_NAME_CHAR_RE.sub("_", name).strip("_") or "input"
+
+
+_DEFAULT_NOTE_TEMPLATE = (
+    "# {title}\n\n"
+    "- Date: {date}\n"
+    "- Source: {source_file}\n"
+    "- STT model: {stt_model}\n"
+    "- Device: {device}\n"
+    "- Compute type: {compute_type}\n\n"
+    "## Summary\n{summary_block}\n\n"
+    "## Action items\n{action_items}\n\n"
+    "## Transcript\n{transcript_block}\n"
+)
+
+_FALLBACK_NOTE_TEMPLATE = (
+    "# {title}\n\n"
+    "- Date: {date}\n"
+    "- Source: {source_file}\n"
+    "- STT model: {stt_model}\n"
+    "- Device: {device}\n"
+    "- Compute type: {compute_type}\n\n"
+    "## Summary\n{summary_block}\n\n"
+    "## Action items\n{action_items_block}\n\n"
+    "## Transcript\n{transcript_block}\n"
+)
+
+
+def _load_note_template(template_path: Path) -> str:
+    try:
+        mtime_ns = template_path.stat().st_mtime_ns
+    except OSError:
+        return _DEFAULT_NOTE_TEMPLATE
+    return _read_note_template(template_path, mtime_ns)
+
+
+# Keyed on mtime so edits to prompts/note_template.md are picked up without restart.
+@lru_cache(maxsize=8)
+def _read_note_template(template_path: Path, mtime_ns: int) -> str:
+    return template_path.read_text(encoding="utf-8")
+
+
+# O_BINARY matters on Windows: without it the CRT translates "\n" to "\r\n".
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+def _write_all(path: Path, data: bytes) -> None:
+    # Unbuffered open/write/close: the payload is already one contiguous buffer.
+    fd = os.open(path, _WRITE_FLAGS, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+
+def _dump_json(payload: Dict[str, object]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    return json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
 
 
 def _format_time(seconds: float) -> str:
-    total = int(seconds)
-    h = total // 3600
-    m = (total % 3600) // 60
-    s = total % 60
+    h, rest = divmod(int(seconds), 3600)
+    m, s = divmod(rest, 60)
     return f"{h:02d}:{m:02d}:{s:02d}"
 
 
@@ -44,21 +121,7 @@ def _render_note(
         def __missing__(self, key: str) -> str:
             return ""
 
-    template_path = cfg.paths.base_dir / "prompts" / "note_template.md"
-    if template_path.exists():
-        template = template_path.read_text(encoding="utf-8")
-    else:
-        template = (
-            "# {title}\n\n"
-            "- Date: {date}\n"
-            "- Source: {source_file}\n"
-            "- STT model: {stt_model}\n"
-            "- Device: {device}\n"
-            "- Compute type: {compute_type}\n\n"
-            "## Summary\n{summary_block}\n\n"
-            "## Action items\n{action_items}\n\n"
-            "## Transcript\n{transcript_block}\n"
-        )
+    template = _load_note_template(cfg.paths.base_dir / "prompts" / "note_template.md")
 
     if summary:
         summary_block = summary
@@ -66,13 +129,11 @@ def _render_note(
         reason = summary_error or "summary skipped"
         summary_block = f"summary skipped: {reason}"
 
-    lines = []
     if cfg.export.include_timestamps:
-        for seg in segments:
-            lines.append(
-                f"[{_format_time(float(seg['start']))} - {_format_time(float(seg['end']))}] {seg['text']}"
-            )
-        transcript_block = "\n".join(lines).strip()
+        fmt = _format_time
+        transcript_block = "\n".join(
+            f"[{fmt(seg['start'])} - {fmt(seg['end'])}] {seg['text']}" for seg in segments
+        ).strip()
     else:
         transcript_block = transcript_text
 
@@ -85,14 +146,11 @@ def _render_note(
     risks_block = "- n/a"
     tags_block = "- n/a"
     if summary:
-        action_match = re.search(
-            r"(?is)##\s*Action items\s*(.+?)(?:\n##\s+|\Z)", summary
-        )
-        decisions_match = re.search(r"(?is)##\s*Decisions\s*(.+?)(?:\n##\s+|\Z)", summary)
-        risks_match = re.search(
-            r"(?is)##\s*Risks.*?\s*(.+?)(?:\n##\s+|\Z)", summary
-        )
-        tags_match = re.search(r"(?is)##\s*Tags\s*(.+?)(?:\n##\s+|\Z)", summary)
+        # Searched independently: one section's body may contain another's heading.
+        action_match = _ACTION_RE.search(summary)
+        decisions_match = _DECISIONS_RE.search(summary)
+        risks_match = _RISKS_RE.search(summary)
+        tags_match = _TAGS_RE.search(summary)
         if action_match:
             action_items_block = action_match.group(1).strip()
         if decisions_match:
@@ -122,54 +180,42 @@ def _render_note(
     )
     rendered = template.format_map(context)
     if "{transcript_block}" in rendered and "{summary_block}" in rendered:
-        fallback_template = (
-            "# {title}\n\n"
-            "- Date: {date}\n"
-            "- Source: {source_file}\n"
-            "- STT model: {stt_model}\n"
-            "- Device: {device}\n"
-            "- Compute type: {compute_type}\n\n"
-            "## Summary\n{summary_block}\n\n"
-            "## Action items\n{action_items_block}\n\n"
-            "## Transcript\n{transcript_block}\n"
-        )
-        return fallback_template.format_map(context)
+        return _FALLBACK_NOTE_TEMPLATE.format_map(context)
     return rendered
 
 
 def _clean_title(raw: str) -> str:
-    text = re.sub(r"\s+", " ", str(raw or "")).strip()
+    text = " ".join(str(raw or "").split())
     text = text.strip("\"'`")
-    text = re.sub(r"[.?!,:;]+$", "", text).strip()
+    text = _TRAIL_PUNCT_RE.sub("", text).strip()
     words = text.split()
     if len(words) > 10:
         words = words[:10]
     cleaned = " ".join(words).strip()
-    return cleaned or "Без названия"
+    return cleaned or _UNTITLED
 
 
 def _first_words_title(text: str, min_words: int = 6, max_words: int = 10) -> str:
-    words = re.findall(r"\w+", text, flags=re.UNICODE)
+    words = _WORD_RE.findall(text)
     if not words:
-        return "Без названия"
+        return _UNTITLED
     size = min(max_words, max(min_words, len(words)))
     return _clean_title(" ".join(words[:size]))
 
 
 def _title_source_text(summary: Optional[str], transcript_text: str) -> str:
     if summary and summary.strip():
-        summary_clean = re.sub(r"(?m)^\s*#+\s*", "", summary).strip()
-        summary_clean = re.sub(r"\s+", " ", summary_clean).strip()
+        summary_clean = " ".join(_HEADING_RE.sub("", summary).split())
         if summary_clean:
             return summary_clean[:500]
-    body = re.sub(r"\s+", " ", transcript_text).strip()
+    body = " ".join(transcript_text.split())
     return body[:400]
 
 
 def make_title(cfg: AppConfig, source_text: str) -> str:
-    source_text = re.sub(r"\s+", " ", source_text).strip()
+    source_text = " ".join(source_text.split())
     if not source_text:
-        return "Без названия"
+        return _UNTITLED
 
     prompt_template_path = cfg.paths.base_dir / "prompts" / "title_ru.txt"
     prompt_template = ""
@@ -185,6 +231,11 @@ def make_title(cfg: AppConfig, source_text: str) -> str:
             "Текст:\n{text}\n"
         )
 
+    cache_key = llm_cache_key("title", cfg.summarize.model.strip(), prompt_template, source_text)
+    cached = llm_cache_get(cfg.paths.cache_dir, cache_key)
+    if cached is not None:
+        return cached
+
     healthy, _ = check_ollama_health(cfg)
     if healthy:
         try:
@@ -196,13 +247,28 @@ def make_title(cfg: AppConfig, source_text: str) -> str:
                 num_predict=32,
                 temperature=0.2,
                 top_p=0.9,
+                stream=True,
+                stop=["\n"],
             )
-            return _clean_title(response)
+            title = _clean_title(response)
+            # An empty answer is not worth caching; the first-words fallback does better.
+            if title != _UNTITLED:
+                llm_cache_put(cfg.paths.cache_dir, cache_key, title)
+                return title
         except Exception:
             pass
     return _first_words_title(source_text)
 
 
+@dataclass
+class ExportedTranscript:
+    out_dir: Path
+    transcript_text: str
+    title: str
+    created_at: str
+    source_file: str
+
+
 def export_outputs(
     cfg: AppConfig,
     source_path: Path,
@@ -212,57 +278,86 @@ def export_outputs(
     summary: Optional[str],
     summary_error: Optional[str],
 ) -> Path:
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return export_transcript(
+        cfg, source_path, transcript_text, segments, stt_meta, summary, summary_error
+    ).out_dir
+
+
+def export_transcript(
+    cfg: AppConfig,
+    source_path: Path,
+    transcript_text: str,
+    segments: List[Dict[str, object]],
+    stt_meta: Dict[str, object],
+    summary: Optional[str],
+    summary_error: Optional[str],
+) -> ExportedTranscript:
+    # Like export_outputs, but also hands back what indexing needs so callers skip re-reading it.
+    # One clock read, so the folder stamp and created_at cannot straddle a second boundary.
+    now = time.localtime()
+    timestamp = time.strftime("%Y%m%d_%H%M%S", now)
     folder_name = f"{timestamp}_{_safe_name(source_path.stem)}"
     out_dir = cfg.paths.output_dir / folder_name
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    created_at = datetime.now().isoformat(timespec="seconds")
+    created_at = time.strftime("%Y-%m-%dT%H:%M:%S", now)
     title_source = _title_source_text(summary, transcript_text)
     title = make_title(cfg, title_source)
 
-    if cfg.export.save_txt:
-        (out_dir / "transcript.txt").write_text(transcript_text, encoding="utf-8")
-
-    if cfg.export.save_json:
-        payload = {
-            "meta": {
-                "created_at": created_at,
-                "source_file": str(source_path),
-                "title": title,
-                "app_version": __version__,
-                "profile": cfg.profile_name,
-                "requested_stt": {
-                    "model_name": cfg.stt.model_name,
-                    "device": cfg.stt.device,
-                    "compute_type": cfg.stt.compute_type,
-                    "beam_size": cfg.stt.beam_size,
-                    "language": cfg.stt.language,
+    # Each file is written on a worker while the next one is serialized/rendered here.
+    pending: List[Future] = []
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        if cfg.export.save_txt:
+            pending.append(
+                pool.submit(_write_all, out_dir / "transcript.txt", transcript_text.encode("utf-8"))
+            )
+
+        if cfg.export.save_json:
+            payload = {
+                "meta": {
+                    "created_at": created_at,
+                    "source_file": str(source_path),
+                    "title": title,
+                    "app_version": __version__,
+                    "profile": cfg.profile_name,
+                    "requested_stt": {
+                        "model_name": cfg.stt.model_name,
+                        "device": cfg.stt.device,
+                        "compute_type": cfg.stt.compute_type,
+                        "beam_size": cfg.stt.beam_size,
+                        "language": cfg.stt.language,
+                    },
+                    **stt_meta,
+                    "summary_status": "ok" if summary else "skipped",
+                    "summary_error": summary_error,
                 },
-                **stt_meta,
-                "summary_status": "ok" if summary else "skipped",
-                "summary_error": summary_error,
-            },
-            "text": transcript_text,
-            "segments": segments,
-            "summary": summary,
-        }
-        (out_dir / "transcript.json").write_text(
-            json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8"
-        )
+                "text": transcript_text,
+                "segments": segments,
+                "summary": summary,
+            }
+            pending.append(pool.submit(_write_all, out_dir / "transcript.json", _dump_json(payload)))
 
-    if cfg.export.save_md:
-        note_text = _render_note(
-            cfg=cfg,
-            source_path=source_path,
-            title=title,
-            transcript_text=transcript_text,
-            segments=segments,
-            stt_meta=stt_meta,
-            summary=summary,
-            summary_error=summary_error,
-            created_at=created_at,
-        )
-        (out_dir / "note.md").write_text(note_text, encoding="utf-8")
+        if cfg.export.save_md:
+            note_text = _render_note(
+                cfg=cfg,
+                source_path=source_path,
+                title=title,
+                transcript_text=transcript_text,
+                segments=segments,
+                stt_meta=stt_meta,
+                summary=summary,
+                summary_error=summary_error,
+                created_at=created_at,
+            )
+            pending.append(pool.submit(_write_all, out_dir / "note.md", note_text.encode("utf-8")))
+
+        for future in pending:
+            future.result()
 
-    return out_dir
+    return ExportedTranscript(
+        out_dir=out_dir,
+        transcript_text=transcript_text,
+        title=title,
+        created_at=created_at,
+        source_file=str(source_path),
+    )
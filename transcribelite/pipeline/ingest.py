@@ -1,18 +1,40 @@
 from __future__ import annotations
 
 import subprocess
+from collections import deque
 from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, Optional
 
 from transcribelite.config import PathsConfig
 from transcribelite.utils.hashing import file_identity_hash
 
+BATCH_MAX_FILES = 8
+
+
+def _cached_wav_path(input_path: Path, paths_cfg: PathsConfig) -> Path:
+    return paths_cfg.cache_dir / f"{file_identity_hash(input_path)}.wav"
+
+
+def _wav_output_args(input_index: int, wav_path: Path) -> List[str]:
+    return [
+        "-map",
+        f"{input_index}:a:0",
+        "-vn",
+        "-ac",
+        "1",
+        "-ar",
+        "16000",
+        "-c:a",
+        "pcm_s16le",
+        str(wav_path),
+    ]
+
 
 def prepare_wav(input_path: Path, paths_cfg: PathsConfig) -> Path:
     if not input_path.exists():
         raise FileNotFoundError(f"Input file does not exist: {input_path}")
 
-    file_hash = file_identity_hash(input_path)
-    wav_path = paths_cfg.cache_dir / f"{file_hash}.wav"
+    wav_path = _cached_wav_path(input_path, paths_cfg)
     if wav_path.exists():
         return wav_path
 
@@ -37,3 +59,119 @@ def prepare_wav(input_path: Path, paths_cfg: PathsConfig) -> Path:
         )
     return wav_path
 
+
+def decode_pcm(input_path: Path, ffmpeg_path: str, tail_seconds: Optional[int] = None) -> Any:
+    # Decode straight into a float32 array (ffmpeg -> stdout -> numpy) for throwaway audio
+    # that would otherwise be written to a temp WAV only to be read back by faster-whisper.
+    cmd = [ffmpeg_path, "-nostdin", "-loglevel", "error"]
+    if tail_seconds:
+        cmd += ["-sseof", f"-{tail_seconds}"]
+    cmd += ["-i", str(input_path), "-vn", "-ac", "1", "-ar", "16000", "-f", "s16le", "-"]
+    completed = subprocess.run(cmd, capture_output=True)
+    if completed.returncode != 0:
+        stderr = completed.stderr.decode("utf-8", errors="replace")
+        raise RuntimeError(f"ffmpeg failed for {input_path}\nstderr:\n{stderr}")
+
+    return pcm_s16le_to_float32(completed.stdout)
+
+
+def decode_pcm_av(input_path: Path, tail_seconds: Optional[int] = None) -> Any:
+    # In-process decode through PyAV (already installed with faster-whisper): no ffmpeg
+    # spawn. Meant for growing recordings, so a truncated last cluster keeps what decoded.
+    import av  # lazy: only the web dictation fallback needs it
+    from av.error import FFmpegError
+
+    keep_bytes = tail_seconds * 16000 * 2 if tail_seconds else 0
+    chunks: Deque[bytes] = deque()
+    held = 0
+    resampler = av.AudioResampler(format="s16", layout="mono", rate=16000)
+
+    def add(frames: Iterable[Any]) -> None:
+        nonlocal held
+        for frame in frames:
+            data = frame.to_ndarray().tobytes()
+            chunks.append(data)
+            held += len(data)
+        while keep_bytes and len(chunks) > 1 and held - len(chunks[0]) >= keep_bytes:
+            held -= len(chunks.popleft())
+
+    with av.open(str(input_path)) as container:
+        stream = container.streams.audio[0]
+        try:
+            for frame in container.decode(stream):
+                add(resampler.resample(frame))
+        except (FFmpegError, EOFError):
+            if not chunks:
+                raise
+        add(resampler.resample(None))
+
+    data = b"".join(chunks)
+    if keep_bytes:
+        data = data[-keep_bytes:]
+    return pcm_s16le_to_float32(data)
+
+
+def pcm_s16le_to_float32(data: bytes) -> Any:
+    import numpy as np  # lazy: only the in-memory path needs numpy
+
+    samples = np.frombuffer(data, dtype="<i2")
+    audio = np.empty(samples.shape, dtype=np.float32)
+    np.multiply(samples, np.float32(1.0 / 32768.0), out=audio)
+    return audio
+
+
+def _convert_batch(batch: List[Path], paths_cfg: PathsConfig) -> Dict[Path, Path]:
+    targets = [_cached_wav_path(src, paths_cfg) for src in batch]
+    # Write to temporary names so a failed batch never leaves partial WAVs in the cache.
+    partials = [wav.with_name(wav.stem + ".part.wav") for wav in targets]
+    cmd = [paths_cfg.ffmpeg_path, "-y", "-nostdin", "-loglevel", "error"]
+    for src in batch:
+        cmd += ["-i", str(src)]
+    for idx, partial in enumerate(partials):
+        cmd += _wav_output_args(idx, partial)
+
+    # The batch is only a shortcut: any failure leaves the files to prepare_wav, which
+    # reports errors per file.
+    try:
+        completed = subprocess.run(cmd, capture_output=True, text=True)
+    except (OSError, subprocess.SubprocessError):
+        completed = None
+    if completed is None or completed.returncode != 0:
+        for partial in partials:
+            partial.unlink(missing_ok=True)
+        return {}
+
+    converted: Dict[Path, Path] = {}
+    for src, partial, wav in zip(batch, partials, targets):
+        try:
+            partial.replace(wav)
+        except OSError:
+            partial.unlink(missing_ok=True)
+            continue
+        converted[src] = wav
+    return converted
+
+
+def batch_prepare_wavs(input_paths: Iterable[Path], paths_cfg: PathsConfig) -> Dict[Path, Path]:
+    # Returns inputs whose WAV is ready in the cache; callers still run prepare_wav for the
+    # rest (single files, failed batches) so errors are reported per file.
+    ready: Dict[Path, Path] = {}
+    groups: Dict[str, List[Path]] = {}
+    for src in input_paths:
+        try:
+            wav_path = _cached_wav_path(src, paths_cfg)
+        except OSError:
+            continue
+        if wav_path.exists():
+            ready[src] = wav_path
+            continue
+        groups.setdefault(src.suffix.lower(), []).append(src)
+
+    for pending in groups.values():
+        if len(pending) == 1:
+            continue
+        for start in range(0, len(pending), BATCH_MAX_FILES):
+            batch = pending[start : start + BATCH_MAX_FILES]
+            if len(batch) > 1:
+                ready.update(_convert_batch(batch, paths_cfg))
+    return ready
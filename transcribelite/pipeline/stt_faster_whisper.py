@@ -1,16 +1,38 @@
 from __future__ import annotations
 
+import struct
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Tuple
 
 from transcribelite.config import AppConfig
+from transcribelite.utils.wav import read_pcm_wav_header
+
+MODEL_CACHE_SIZE = 2
+
+_MODEL_CACHE: "OrderedDict[Tuple[str, str, str, str], Any]" = OrderedDict()
+# Guards only the cache dict; a load never runs under it, so cached models stay reachable
+# while another model is loading.
+_MODEL_CACHE_LOCK = threading.Lock()
+# One lock per model being loaded, so concurrent callers (web jobs, dictation sessions)
+# wait for and share a single load instead of each loading the same weights.
+_MODEL_LOAD_LOCKS: Dict[Tuple[str, str, str, str], threading.Lock] = {}
+
+
+# compute_type = auto: int8 weights everywhere, fp16 activations on GPU.
+AUTO_COMPUTE_TYPES = {"cuda": "int8_float16", "cpu": "int8"}
 
 
 def _resolve_device_and_compute(preferred_device: str, preferred_compute: str) -> Tuple[str, str]:
     device = preferred_device.lower()
-    compute_type = preferred_compute
+    compute_type = preferred_compute.strip().lower()
     if device != "cuda":
-        return "cpu", "int8" if compute_type == "float16" else compute_type
+        if compute_type in ("auto", "float16", "int8_float16"):
+            return "cpu", AUTO_COMPUTE_TYPES["cpu"]
+        return "cpu", compute_type
+    if compute_type == "auto":
+        compute_type = AUTO_COMPUTE_TYPES["cuda"]
 
     try:
         import torch  # type: ignore
@@ -22,19 +44,113 @@ def _resolve_device_and_compute(preferred_device: str, preferred_compute: str) -
     return "cpu", "int8"
 
 
+def compute_attempts(preferred_device: str, preferred_compute: str) -> List[Tuple[str, str]]:
+    device, compute_type = _resolve_device_and_compute(preferred_device, preferred_compute)
+    attempts = [(device, compute_type)]
+    if device == "cuda":
+        # GPUs without int8 kernels reject int8_float16; degrade precision stepwise.
+        if compute_type == "int8_float16":
+            attempts.append(("cuda", "float16"))
+        if compute_type != "float32":
+            attempts.append(("cuda", "float32"))
+    if ("cpu", "int8") not in attempts:
+        attempts.append(("cpu", "int8"))
+    return attempts
+
+
+def _cached_model(key: Tuple[str, str, str, str]) -> Any:
+    model = _MODEL_CACHE.get(key)
+    if model is not None:
+        _MODEL_CACHE.move_to_end(key)
+    return model
+
+
+def get_model(
+    model_name: str,
+    device: str,
+    compute_type: str,
+    download_root: str,
+    cache_size: int = MODEL_CACHE_SIZE,
+) -> Any:
+    key = (model_name, device, compute_type, download_root)
+    with _MODEL_CACHE_LOCK:
+        model = _cached_model(key)
+        if model is not None:
+            return model
+        load_lock = _MODEL_LOAD_LOCKS.setdefault(key, threading.Lock())
+
+    with load_lock:
+        with _MODEL_CACHE_LOCK:
+            model = _cached_model(key)
+        if model is not None:
+            return model
+
+        from faster_whisper import WhisperModel  # lazy import for doctor/fallback clarity
+
+        # Make room before loading: the web server lives on, and keeping old models resident
+        # while the next one loads is what runs a GPU out of memory.
+        with _MODEL_CACHE_LOCK:
+            while _MODEL_CACHE and len(_MODEL_CACHE) >= cache_size:
+                _MODEL_CACHE.popitem(last=False)
+
+        try:
+            model = WhisperModel(
+                model_name,
+                device=device,
+                compute_type=compute_type,
+                download_root=download_root,
+            )
+            with _MODEL_CACHE_LOCK:
+                _MODEL_CACHE[key] = model
+                while len(_MODEL_CACHE) > cache_size:
+                    _MODEL_CACHE.popitem(last=False)
+            return model
+        finally:
+            with _MODEL_CACHE_LOCK:
+                _MODEL_LOAD_LOCKS.pop(key, None)
+
+
+def _load_audio(wav_path: Path) -> Any:
+    # Our cached WAVs are already 16 kHz mono s16le: map the samples straight into a float32
+    # array instead of letting faster-whisper decode and resample them through PyAV.
+    try:
+        header = read_pcm_wav_header(wav_path)
+    except (OSError, ValueError, struct.error):
+        return str(wav_path)
+    if header is None or (header.channels, header.sample_rate, header.bits_per_sample) != (1, 16000, 16):
+        return str(wav_path)
+    try:
+        import numpy as np  # type: ignore
+
+        samples = np.memmap(
+            str(wav_path),
+            dtype="<i2",
+            mode="r",
+            offset=header.data_offset,
+            shape=(header.data_size // 2,),
+        )
+        audio = np.empty(samples.shape, dtype=np.float32)
+        np.multiply(samples, np.float32(1.0 / 32768.0), out=audio)
+        del samples
+        return audio
+    except (ImportError, OSError, ValueError):
+        return str(wav_path)
+
+
 def transcribe_file(wav_path: Path, cfg: AppConfig) -> Dict[str, object]:
-    from faster_whisper import WhisperModel  # lazy import for doctor/fallback clarity
+    audio = _load_audio(wav_path)
 
     def _run(device: str, compute_type: str) -> Tuple[List[Dict[str, object]], str, object]:
-        model = WhisperModel(
+        model = get_model(
             cfg.stt.model_name,
-            device=device,
-            compute_type=compute_type,
-            download_root=str(cfg.paths.models_dir),
+            device,
+            compute_type,
+            str(cfg.paths.models_dir),
+            cache_size=cfg.stt.model_cache_size,
         )
         language = None if cfg.stt.language.lower() == "auto" else cfg.stt.language
         segments_iter, info = model.transcribe(
-            str(wav_path),
+            audio,
             language=language,
             task=cfg.stt.task,
             beam_size=cfg.stt.beam_size,
@@ -42,18 +158,18 @@ def transcribe_file(wav_path: Path, cfg: AppConfig) -> Dict[str, object]:
         )
         segments: List[Dict[str, object]] = []
         text_parts: List[str] = []
+        seg_append = segments.append
+        text_append = text_parts.append
         for seg in segments_iter:
             segment_text = seg.text.strip()
             if segment_text:
-                text_parts.append(segment_text)
-            segments.append({"start": float(seg.start), "end": float(seg.end), "text": segment_text})
-        return segments, " ".join(text_parts).strip(), info
+                text_append(segment_text)
+            seg_append({"start": float(seg.start), "end": float(seg.end), "text": segment_text})
+        # Parts are stripped and non-empty, so the joined text needs no outer strip().
+        return segments, " ".join(text_parts), info
 
-    device, compute_type = _resolve_device_and_compute(cfg.stt.device, cfg.stt.compute_type)
-    attempts = [(device, compute_type)]
-    if device == "cuda" and compute_type != "float32":
-        attempts.append(("cuda", "float32"))
-    attempts.append(("cpu", "int8"))
+    attempts = compute_attempts(cfg.stt.device, cfg.stt.compute_type)
+    device, compute_type = attempts[0]
 
     last_exc: Exception | None = None
     for attempt_device, attempt_compute in attempts:
@@ -1,11 +1,38 @@
 from __future__ import annotations
 
+import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import requests
+
+try:
+    # Optional: faster parsing of the NDJSON progress/token streams.
+    import orjson
+except ImportError:
+    orjson = None
+
 from transcribelite.config import AppConfig
+from transcribelite.utils.http import RETRY_STATUSES, backoff_delay, http_session, http_timeout
+from transcribelite.utils.llm_cache import llm_cache_get, llm_cache_key, llm_cache_put
+
+
+HEALTH_CACHE_TTL_S = 5.0
+HEALTH_TIMEOUT_S = 5
+
+# (base_url, is_cloud) -> (expires_at, result); one export asks several times in a row.
+_HEALTH_CACHE: Dict[Tuple[str, bool], Tuple[float, Tuple[bool, str]]] = {}
+
+# Installed models change rarely; successful /api/tags answers are reused for a while.
+TAGS_CACHE_TTL_S = 300.0
+
+_TAGS_CACHE: Dict[Tuple[str, bool], Tuple[float, List[str]]] = {}
+
+PULL_PROGRESS_INTERVAL_S = 0.1
 
 
 class OllamaError(RuntimeError):
@@ -19,23 +46,39 @@ class OllamaAuthError(OllamaError):
 def _split_text(text: str, max_chars: int) -> List[str]:
     if len(text) <= max_chars:
         return [text]
+    # Sweep line boundaries by index and slice whole chunks out of `text`,
+    # instead of splitting into lines and re-joining them per chunk.
     chunks: List[str] = []
-    current = []
+    find = text.find
+    chunk_start = 0
     current_len = 0
-    for part in text.split("\n"):
-        addition = len(part) + 1
-        if current and current_len + addition > max_chars:
-            chunks.append("\n".join(current).strip())
-            current = [part]
-            current_len = len(part)
+    has_lines = False
+    pos = 0
+    end = len(text)
+    while True:
+        nl = find("\n", pos)
+        line_end = end if nl < 0 else nl
+        part_len = line_end - pos
+        if has_lines and current_len + part_len + 1 > max_chars:
+            chunks.append(text[chunk_start : pos - 1].strip())
+            chunk_start = pos
+            current_len = part_len
         else:
-            current.append(part)
-            current_len += addition
-    if current:
-        chunks.append("\n".join(current).strip())
+            current_len += part_len + 1
+            has_lines = True
+        if nl < 0:
+            break
+        pos = nl + 1
+    chunks.append(text[chunk_start:].strip())
     return [c for c in chunks if c]
 
 
+# Keyed on mtime so an edited prompt file is re-read on the next call.
+@lru_cache(maxsize=8)
+def _read_prompt_template(template_path: Path, mtime_ns: int) -> str:
+    return template_path.read_text(encoding="utf-8")
+
+
 def _render_prompt(template_text: str, transcript: str) -> str:
     if "{transcript}" in template_text:
         return template_text.format(transcript=transcript)
@@ -91,17 +134,22 @@ def _request_json(
     auth_error_message: str = "нужен ключ OLLAMA_API_KEY",
 ) -> dict[str, Any]:
     last_exc: Optional[Exception] = None
-    for _ in range(retries + 1):
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(backoff_delay(attempt - 1))
         try:
-            response = requests.request(
+            response = http_session().request(
                 method,
                 url,
-                timeout=timeout_s,
+                timeout=http_timeout(timeout_s),
                 headers=headers or None,
                 json=json_payload,
             )
             if response.status_code == 401:
                 raise OllamaAuthError(auth_error_message)
+            if response.status_code in RETRY_STATUSES and attempt < retries:
+                last_exc = OllamaError(f"Ollama HTTP {response.status_code}")
+                continue
             if response.status_code >= 400:
                 message = ""
                 try:
@@ -117,8 +165,11 @@ def _request_json(
             return payload if isinstance(payload, dict) else {}
         except OllamaError:
             raise
-        except Exception as exc:  # noqa: BLE001
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            # Only transport failures are worth another attempt.
             last_exc = exc
+        except Exception as exc:  # noqa: BLE001
+            raise OllamaError("ollama request failed") from exc
     raise OllamaError("ollama request failed") from last_exc
 
 
@@ -127,7 +178,13 @@ def _list_tags_from_target(
     base_url: str,
     is_cloud: bool,
     timeout_s: int = 15,
+    use_cache: bool = True,
 ) -> list[str]:
+    key = (base_url, is_cloud)
+    if use_cache:
+        cached = _TAGS_CACHE.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return list(cached[1])
     headers = get_auth_headers(cfg, is_cloud)
     auth_error_message = f"нужен ключ {_api_key_env_name(cfg)}"
     data = _request_json(
@@ -148,9 +205,16 @@ def _list_tags_from_target(
         name = str(model.get("name") or "").strip()
         if name:
             names.append(name)
+    _TAGS_CACHE[key] = (time.monotonic() + TAGS_CACHE_TTL_S, list(names))
     return names
 
 
+def refresh_ollama_tags() -> None:
+    # Drop cached tag lists and health verdicts (after a pull, or when the user asks).
+    _TAGS_CACHE.clear()
+    _HEALTH_CACHE.clear()
+
+
 def check_ollama_health(cfg: AppConfig, model_name: Optional[str] = None) -> Tuple[bool, str]:
     target_model = model_name or cfg.summarize.model
     base_url, is_cloud = resolve_ollama_target(
@@ -159,13 +223,21 @@ def check_ollama_health(cfg: AppConfig, model_name: Optional[str] = None) -> Tup
         cfg.summarize.ollama_url_local,
         cfg.summarize.ollama_url_cloud,
     )
+    key = (base_url, is_cloud)
+    now = time.monotonic()
+    cached = _HEALTH_CACHE.get(key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
     try:
-        _list_tags_from_target(cfg, base_url, is_cloud, timeout_s=10)
-        return True, "ok"
+        # Always a live probe: a cached tag list would report an outage as healthy.
+        _list_tags_from_target(cfg, base_url, is_cloud, timeout_s=HEALTH_TIMEOUT_S, use_cache=False)
+        result = (True, "ok")
     except OllamaAuthError as exc:
-        return False, str(exc)
+        result = (False, str(exc))
     except Exception as exc:  # noqa: BLE001
-        return False, str(exc)
+        result = (False, str(exc))
+    _HEALTH_CACHE[key] = (now + HEALTH_CACHE_TTL_S, result)
+    return result
 
 
 def _is_model_not_found_error(exc: Exception) -> bool:
@@ -173,6 +245,64 @@ def _is_model_not_found_error(exc: Exception) -> bool:
     return "not found" in text and "model" in text
 
 
+def _cut_at_stop(text: str, stop: List[str]) -> Optional[str]:
+    # A stop marker only counts once some real text precedes it, so a model that
+    # opens with a blank line still gets to produce its answer.
+    start = len(text) - len(text.lstrip())
+    for marker in stop:
+        idx = text.find(marker, start)
+        if idx > start:
+            return text[:idx]
+    return None
+
+
+def _stream_generate(
+    url: str,
+    payload: dict[str, Any],
+    timeout_s: int,
+    headers: dict[str, str],
+    stop: List[str],
+    auth_error_message: str,
+) -> str:
+    parts: List[str] = []
+    with http_session().post(
+        url,
+        json={**payload, "stream": True},
+        timeout=http_timeout(timeout_s),
+        headers=headers or None,
+        stream=True,
+    ) as response:
+        if response.status_code == 401:
+            raise OllamaAuthError(auth_error_message)
+        if response.status_code >= 400:
+            message = ""
+            try:
+                data = response.json()
+                if isinstance(data, dict):
+                    message = str(data.get("error") or "").strip()
+            except Exception:
+                message = response.text.strip()
+            raise OllamaError(message or f"Ollama HTTP {response.status_code}")
+        for raw_line in response.iter_lines(decode_unicode=True):
+            if not raw_line:
+                continue
+            row = request_json_line(raw_line)
+            if row.get("error"):
+                raise OllamaError(str(row["error"]))
+            token = row.get("response")
+            if isinstance(token, str) and token:
+                parts.append(token)
+                if stop and any(marker in token for marker in stop):
+                    cut = _cut_at_stop("".join(parts), stop)
+                    if cut is not None:
+                        # Closing the response drops the connection; the rest
+                        # of the generation is never waited for.
+                        return cut.strip()
+            if row.get("done"):
+                break
+    return "".join(parts).strip()
+
+
 def generate_text(
     cfg: AppConfig,
     prompt: str,
@@ -181,6 +311,8 @@ def generate_text(
     temperature: Optional[float] = None,
     top_p: Optional[float] = None,
     model_override: Optional[str] = None,
+    stream: bool = False,
+    stop: Optional[List[str]] = None,
 ) -> str:
     model_name = (model_override or cfg.summarize.model).strip()
     options: dict[str, Any] = {}
@@ -209,6 +341,23 @@ def generate_text(
     def _run(target_url: str, cloud: bool) -> str:
         headers = get_auth_headers(cfg, cloud)
         auth_error_message = f"нужен ключ {_api_key_env_name(cfg)}"
+        if stream:
+            try:
+                text = _stream_generate(
+                    f"{target_url}/api/generate",
+                    payload,
+                    timeout_s or cfg.summarize.timeout_s,
+                    headers,
+                    stop or [],
+                    auth_error_message,
+                )
+            except OllamaError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                raise OllamaError("ollama request failed") from exc
+            if not text:
+                raise OllamaError("Ollama returned empty response")
+            return text
         data = _request_json(
             "POST",
             f"{target_url}/api/generate",
@@ -226,8 +375,11 @@ def generate_text(
     try:
         return _run(base_url, is_cloud)
     except OllamaAuthError as exc:
+        refresh_ollama_tags()
         raise OllamaError(str(exc)) from exc
     except OllamaError as exc:
+        # A failed call means the cached "healthy" verdict may be stale.
+        refresh_ollama_tags()
         should_fallback = (
             mode == "auto"
             and not is_cloud
@@ -258,24 +410,36 @@ def list_ollama_models_detailed(cfg: AppConfig) -> list[dict[str, Any]]:
                 "sources": [source],
             }
 
-    if mode in {"local", "auto"}:
-        try:
-            local_names = _list_tags_from_target(cfg, cfg.summarize.ollama_url_local.rstrip("/"), False)
-            add(local_names, "local", False)
-        except Exception:
-            pass
+    # In auto mode both /api/tags round-trips run concurrently; results are still merged
+    # local-first so "sources" keeps its order.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        local_future = None
+        cloud_future = None
+        if mode in {"local", "auto"}:
+            local_future = pool.submit(
+                _list_tags_from_target, cfg, cfg.summarize.ollama_url_local.rstrip("/"), False
+            )
+        if mode in {"cloud", "auto"}:
+            cloud_future = pool.submit(
+                _list_tags_from_target, cfg, cfg.summarize.ollama_url_cloud.rstrip("/"), True
+            )
 
-    if mode in {"cloud", "auto"}:
-        try:
-            cloud_names = _list_tags_from_target(cfg, cfg.summarize.ollama_url_cloud.rstrip("/"), True)
-            add(cloud_names, "cloud", True)
-        except OllamaAuthError:
-            # In auto mode we still return local models without failing.
-            if mode == "cloud":
-                raise
-        except Exception:
-            if mode == "cloud":
-                raise
+        if local_future is not None:
+            try:
+                add(local_future.result(), "local", False)
+            except Exception:
+                pass
+
+        if cloud_future is not None:
+            try:
+                add(cloud_future.result(), "cloud", True)
+            except OllamaAuthError:
+                # In auto mode we still return local models without failing.
+                if mode == "cloud":
+                    raise
+            except Exception:
+                if mode == "cloud":
+                    raise
 
     names = sorted(items.keys(), key=lambda s: s.lower())
     return [items[name] for name in names]
@@ -303,6 +467,9 @@ def ensure_model_available(
     )
 
     names = _list_tags_from_target(cfg, base_url, is_cloud, timeout_s=15)
+    if required not in names:
+        # A cached list may predate an external `ollama pull`; ask again before downloading.
+        names = _list_tags_from_target(cfg, base_url, is_cloud, timeout_s=15, use_cache=False)
     if required in names:
         if on_progress:
             on_progress("model already available")
@@ -316,13 +483,21 @@ def ensure_model_available(
 
     url = f"{base_url}/api/pull"
     payload = {"name": required, "stream": True}
-    with requests.post(url, json=payload, timeout=timeout_s, stream=True) as response:
+    with http_session().post(url, json=payload, timeout=http_timeout(timeout_s), stream=True) as response:
         if response.status_code >= 400:
             message = response.text.strip() or f"Ollama HTTP {response.status_code}"
             raise OllamaError(message)
-        for raw_line in response.iter_lines(decode_unicode=True):
+        # Pulls emit thousands of progress frames; parse at most ~10 per second, but never
+        # skip terminal or error frames.
+        last_emit = 0.0
+        for raw_line in response.iter_lines():
             if not raw_line:
                 continue
+            now = time.monotonic()
+            throttled = now - last_emit < PULL_PROGRESS_INTERVAL_S
+            if throttled and b'"error"' not in raw_line and b'"success"' not in raw_line:
+                continue
+            last_emit = now
             status = ""
             try:
                 row = request_json_line(raw_line)
@@ -333,15 +508,14 @@ def ensure_model_available(
                     pct = int((completed / total) * 100)
                     status = f"{status} ({pct}%)"
             except Exception:
-                status = str(raw_line).strip()
+                status = raw_line.decode("utf-8", errors="replace").strip()
             if on_progress and status:
                 on_progress(status)
+    refresh_ollama_tags()
 
 
-def request_json_line(raw_line: str) -> dict:
-    import json
-
-    data = json.loads(raw_line)
+def request_json_line(raw_line: str | bytes) -> dict:
+    data = orjson.loads(raw_line) if orjson is not None else json.loads(raw_line)
     if not isinstance(data, dict):
         return {}
     return data
@@ -358,16 +532,36 @@ def summarize_text(transcript: str, cfg: AppConfig) -> Tuple[Optional[str], Opti
         return None, f"ollama unavailable: {reason}"
 
     template_path: Path = cfg.summarize.prompt_template
-    if not template_path.exists():
+    try:
+        mtime_ns = template_path.stat().st_mtime_ns
+    except OSError:
         return None, f"prompt template missing: {template_path}"
-    template = template_path.read_text(encoding="utf-8")
+    template = _read_prompt_template(template_path, mtime_ns)
+
+    cache_dir = cfg.paths.cache_dir
+    model_name = cfg.summarize.model.strip()
+
+    # Identical prompts (re-runs of the same transcript) are answered from disk.
+    def _generate(prompt: str) -> str:
+        key = llm_cache_key("summary", model_name, prompt)
+        cached = llm_cache_get(cache_dir, key)
+        if cached is not None:
+            return cached
+        result = generate_text(cfg, prompt)
+        if result.strip():
+            llm_cache_put(cache_dir, key, result)
+        return result
 
     try:
         chunks = _split_text(transcript, cfg.summarize.max_chars)
-        chunk_summaries: List[str] = []
-        for chunk in chunks:
-            prompt = _render_prompt(template, chunk)
-            chunk_summaries.append(generate_text(cfg, prompt))
+        prompts = [_render_prompt(template, chunk) for chunk in chunks]
+        workers = min(cfg.summarize.concurrency, len(prompts))
+        if workers > 1:
+            # Requests are I/O bound; map() keeps chunk order for the final merge.
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                chunk_summaries = list(pool.map(_generate, prompts))
+        else:
+            chunk_summaries = [_generate(prompt) for prompt in prompts]
         if len(chunk_summaries) == 1:
             return chunk_summaries[0], None
 
@@ -377,6 +571,6 @@ def summarize_text(transcript: str, cfg: AppConfig) -> Tuple[Optional[str], Opti
                 f"Summary chunk {i + 1}:\n{summary}" for i, summary in enumerate(chunk_summaries)
             ),
         )
-        return generate_text(cfg, final_prompt), None
+        return _generate(final_prompt), None
     except Exception as exc:  # noqa: BLE001
         return None, str(exc)
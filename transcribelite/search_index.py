@@ -2,12 +2,31 @@ from __future__ import annotations
 
 import re
 import sqlite3
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 from transcribelite.utils.chunking import chunk_text_words
 
+# Merge FTS5 index segments after this many re-indexed jobs in one process.
+FTS_OPTIMIZE_EVERY_JOBS = 50
+SQLITE_CACHE_KIB = 64 * 1024
+SQLITE_MMAP_BYTES = 256 * 1024 * 1024
+# Global search snippets are cut by FTS5 around the matched terms (about 280 chars).
+SNIPPET_TOKENS = 40
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_jobs_since_optimize = 0
+
+# One connection per (thread, db file): sqlite3 connections must stay on their thread,
+# and thread-local storage closes them when the worker thread goes away.
+_LOCAL = threading.local()
+_SCHEMA_READY: set[str] = set()
+_SCHEMA_LOCK = threading.Lock()
+
 
 @dataclass
 class ChunkHit:
@@ -21,7 +40,7 @@ class GlobalChunkHit:
     chunk_id: int
     job_id: str
     chunk_index: int
-    text: str
+    snippet: str
     title: str
     created_at: str
     output_dir: str
@@ -56,10 +75,55 @@ class TranscriptionHistoryItem:
 
 
 def open_db(db_path: Path) -> sqlite3.Connection:
+    key = str(db_path)
+    conns = getattr(_LOCAL, "conns", None)
+    if conns is None:
+        conns = _LOCAL.conns = {}
+    conn = conns.get(key)
+    if conn is not None:
+        return conn
+
     db_path.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(db_path))
-    conn.execute("PRAGMA journal_mode=WAL")
+    conn = sqlite3.connect(key)
     conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    # Serve FTS5 page reads from a memory map / larger page cache instead of pread calls.
+    conn.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_KIB}")
+    conn.execute(f"PRAGMA mmap_size={SQLITE_MMAP_BYTES}")
+    with _SCHEMA_LOCK:
+        if key not in _SCHEMA_READY:
+            _init_schema(conn)
+            _SCHEMA_READY.add(key)
+    conns[key] = conn
+    return conn
+
+
+@contextmanager
+def write_transaction(db_path: Path) -> Iterator[sqlite3.Connection]:
+    # Lets callers group several writes (index + history) into one commit/fsync.
+    conn = open_db(db_path)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+@contextmanager
+def _writer(db_path: Path, conn: Optional[sqlite3.Connection]) -> Iterator[sqlite3.Connection]:
+    if conn is not None:
+        # Caller owns the transaction (see write_transaction).
+        yield conn
+        return
+    with write_transaction(db_path) as own:
+        yield own
+
+
+def _init_schema(conn: sqlite3.Connection) -> None:
+    # journal_mode is persistent in the database file, so it is set with the schema.
+    conn.execute("PRAGMA journal_mode=WAL")
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS meta (
@@ -118,8 +182,10 @@ def open_db(db_path: Path) -> sqlite3.Connection:
     cols = {str(row[1]) for row in conn.execute("PRAGMA table_info(transcription_history)").fetchall()}
     if "title" not in cols:
         conn.execute("ALTER TABLE transcription_history ADD COLUMN title TEXT NOT NULL DEFAULT ''")
-        conn.commit()
-    return conn
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_transcription_history_job_id ON transcription_history(job_id)"
+    )
+    conn.commit()
 
 
 def index_job(
@@ -131,14 +197,14 @@ def index_job(
     created_at: str,
     words_per_chunk: int = 450,
     overlap: int = 60,
+    conn: Optional[sqlite3.Connection] = None,
 ) -> int:
     chunks = chunk_text_words(
         transcript_text,
         words_per_chunk=words_per_chunk,
         overlap=overlap,
     )
-    with open_db(db_path) as conn:
-        conn.execute("BEGIN")
+    with _writer(db_path, conn) as conn:
         conn.execute("DELETE FROM chunks_fts WHERE job_id = ?", (job_id,))
         conn.execute(
             """
@@ -151,17 +217,29 @@ def index_job(
             """,
             (job_id, output_dir, title, created_at),
         )
-        for i, chunk in enumerate(chunks):
-            conn.execute(
-                "INSERT INTO chunks_fts(job_id, chunk_index, text) VALUES(?, ?, ?)",
-                (job_id, i, chunk),
-            )
-        conn.commit()
+        conn.executemany(
+            "INSERT INTO chunks_fts(job_id, chunk_index, text) VALUES(?, ?, ?)",
+            ((job_id, i, chunk) for i, chunk in enumerate(chunks)),
+        )
+        _maybe_optimize_fts(conn)
     return len(chunks)
 
 
+def _maybe_optimize_fts(conn: sqlite3.Connection) -> None:
+    global _jobs_since_optimize
+    _jobs_since_optimize += 1
+    if _jobs_since_optimize < FTS_OPTIMIZE_EVERY_JOBS:
+        return
+    _jobs_since_optimize = 0
+    try:
+        conn.execute("INSERT INTO chunks_fts(chunks_fts) VALUES('optimize')")
+    except sqlite3.Error:
+        # Optimisation is best-effort; a busy database just skips this round.
+        pass
+
+
 def _extract_query_tokens(text: str) -> list[str]:
-    tokens = [t for t in re.findall(r"\w+", text.lower(), flags=re.UNICODE) if len(t) > 1]
+    tokens = [t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 1]
     unique_tokens: list[str] = []
     seen = set()
     for token in tokens:
@@ -174,47 +252,39 @@ def _extract_query_tokens(text: str) -> list[str]:
     return unique_tokens
 
 
+def _fts_match_expr(tokens: list[str]) -> str:
+    # One OR-ed prefix query lets bm25 rank chunks against the whole question.
+    return " OR ".join('"' + token.replace('"', '""') + '"*' for token in tokens)
+
+
 def search_chunks(db_path: Path, question: str, job_id: str, limit: int = 6) -> List[ChunkHit]:
     limit = max(1, min(int(limit), 12))
     tokens = _extract_query_tokens(question)
     if not tokens:
         return []
 
-    collected: list[ChunkHit] = []
-    seen_ids: set[int] = set()
-
     with open_db(db_path) as conn:
-        for token in tokens:
-            token_query = f"\"{token}\"*"
-            try:
-                rows = conn.execute(
-                    """
-                    SELECT rowid, CAST(chunk_index AS INTEGER), text
-                    FROM chunks_fts
-                    WHERE job_id = ? AND chunks_fts MATCH ?
-                    ORDER BY bm25(chunks_fts)
-                    LIMIT ?
-                    """,
-                    (job_id, token_query, limit),
-                ).fetchall()
-            except sqlite3.OperationalError:
-                continue
-
-            for row in rows:
-                chunk_id = int(row[0])
-                if chunk_id in seen_ids:
-                    continue
-                seen_ids.add(chunk_id)
-                collected.append(
-                    ChunkHit(
-                        chunk_id=chunk_id,
-                        chunk_index=int(row[1]),
-                        text=str(row[2]),
-                    )
-                )
-                if len(collected) >= limit:
-                    return collected
-    return collected
+        try:
+            rows = conn.execute(
+                """
+                SELECT rowid, CAST(chunk_index AS INTEGER), text
+                FROM chunks_fts
+                WHERE job_id = ? AND chunks_fts MATCH ?
+                ORDER BY bm25(chunks_fts)
+                LIMIT ?
+                """,
+                (job_id, _fts_match_expr(tokens), limit),
+            ).fetchall()
+        except sqlite3.OperationalError:
+            return []
+    return [
+        ChunkHit(
+            chunk_id=int(row[0]),
+            chunk_index=int(row[1]),
+            text=str(row[2]),
+        )
+        for row in rows
+    ]
 
 
 def search_global_chunks(db_path: Path, question: str, limit: int = 12) -> List[GlobalChunkHit]:
@@ -223,53 +293,47 @@ def search_global_chunks(db_path: Path, question: str, limit: int = 12) -> List[
     if not tokens:
         return []
 
-    collected: list[GlobalChunkHit] = []
-    seen_ids: set[int] = set()
+    with open_db(db_path) as conn:
+        try:
+            rows = conn.execute(
+                """
+                SELECT
+                    f.rowid,
+                    f.job_id,
+                    CAST(f.chunk_index AS INTEGER),
+                    snippet(chunks_fts, 2, '', '', '...', ?),
+                    m.title,
+                    m.created_at,
+                    m.output_dir
+                FROM chunks_fts AS f
+                LEFT JOIN meta AS m ON m.job_id = f.job_id
+                WHERE chunks_fts MATCH ?
+                ORDER BY bm25(chunks_fts)
+                LIMIT ?
+                """,
+                (SNIPPET_TOKENS, _fts_match_expr(tokens), limit),
+            ).fetchall()
+        except sqlite3.OperationalError:
+            return []
+    return [
+        GlobalChunkHit(
+            chunk_id=int(row[0]),
+            job_id=str(row[1]),
+            chunk_index=int(row[2]),
+            snippet=str(row[3]),
+            title=str(row[4] or ""),
+            created_at=str(row[5] or ""),
+            output_dir=str(row[6] or ""),
+        )
+        for row in rows
+    ]
+
 
+def _history_json_array(db_path: Path, sql: str, limit: int) -> str:
+    # The *_json listings let SQLite's JSON1 build the whole array for the HTTP layer.
     with open_db(db_path) as conn:
-        for token in tokens:
-            token_query = f"\"{token}\"*"
-            try:
-                rows = conn.execute(
-                    """
-                    SELECT
-                        f.rowid,
-                        f.job_id,
-                        CAST(f.chunk_index AS INTEGER),
-                        f.text,
-                        m.title,
-                        m.created_at,
-                        m.output_dir
-                    FROM chunks_fts AS f
-                    LEFT JOIN meta AS m ON m.job_id = f.job_id
-                    WHERE chunks_fts MATCH ?
-                    ORDER BY bm25(chunks_fts)
-                    LIMIT ?
-                    """,
-                    (token_query, limit),
-                ).fetchall()
-            except sqlite3.OperationalError:
-                continue
-
-            for row in rows:
-                chunk_id = int(row[0])
-                if chunk_id in seen_ids:
-                    continue
-                seen_ids.add(chunk_id)
-                collected.append(
-                    GlobalChunkHit(
-                        chunk_id=chunk_id,
-                        job_id=str(row[1]),
-                        chunk_index=int(row[2]),
-                        text=str(row[3]),
-                        title=str(row[4] or ""),
-                        created_at=str(row[5] or ""),
-                        output_dir=str(row[6] or ""),
-                    )
-                )
-                if len(collected) >= limit:
-                    return collected
-    return collected
+        row = conn.execute(sql, (limit,)).fetchone()
+    return str(row[0]) if row and row[0] else "[]"
 
 
 def add_qa_history(
@@ -315,14 +379,29 @@ def list_qa_history(db_path: Path, limit: int = 50) -> List[QaHistoryItem]:
     ]
 
 
+def list_qa_history_json(db_path: Path, limit: int = 50) -> str:
+    limit = max(1, min(int(limit), 200))
+    return _history_json_array(
+        db_path,
+        """
+        SELECT json_group_array(
+            json_object('id', id, 'job_id', job_id, 'question', question, 'answer', answer, 'created_at', created_at)
+        )
+        FROM (SELECT * FROM qa_history ORDER BY id DESC LIMIT ?)
+        """,
+        limit,
+    )
+
+
 def add_dictation_history(
     db_path: Path,
     job_id: str,
     output_dir: str,
     text_preview: str,
     created_at: str,
+    conn: Optional[sqlite3.Connection] = None,
 ) -> int:
-    with open_db(db_path) as conn:
+    with _writer(db_path, conn) as conn:
         cur = conn.execute(
             """
             INSERT INTO dictation_history(job_id, output_dir, text_preview, created_at)
@@ -330,7 +409,6 @@ def add_dictation_history(
             """,
             (job_id, output_dir, text_preview, created_at),
         )
-        conn.commit()
         return int(cur.lastrowid or 0)
 
 
@@ -358,6 +436,23 @@ def list_dictation_history(db_path: Path, limit: int = 50) -> List[DictationHist
     ]
 
 
+def list_dictation_history_json(db_path: Path, limit: int = 50) -> str:
+    limit = max(1, min(int(limit), 200))
+    return _history_json_array(
+        db_path,
+        """
+        SELECT json_group_array(
+            json_object(
+                'id', id, 'job_id', job_id, 'output_dir', output_dir,
+                'text_preview', text_preview, 'created_at', created_at
+            )
+        )
+        FROM (SELECT * FROM dictation_history ORDER BY id DESC LIMIT ?)
+        """,
+        limit,
+    )
+
+
 def delete_dictation_history_item(db_path: Path, item_id: int) -> bool:
     with open_db(db_path) as conn:
         cur = conn.execute("DELETE FROM dictation_history WHERE id = ?", (int(item_id),))
@@ -372,8 +467,9 @@ def add_transcription_history(
     title: str,
     output_dir: str,
     created_at: str,
+    conn: Optional[sqlite3.Connection] = None,
 ) -> int:
-    with open_db(db_path) as conn:
+    with _writer(db_path, conn) as conn:
         cur = conn.execute(
             """
             INSERT INTO transcription_history(job_id, source_name, title, output_dir, created_at)
@@ -381,38 +477,16 @@ def add_transcription_history(
             """,
             (job_id, source_name, title, output_dir, created_at),
         )
-        conn.commit()
         return int(cur.lastrowid or 0)
 
 
 def list_transcription_history(db_path: Path, limit: int = 50) -> List[TranscriptionHistoryItem]:
     limit = max(1, min(int(limit), 300))
+    # open_db migrates older databases, so the title column is always present here.
     with open_db(db_path) as conn:
-        cols = {str(row[1]) for row in conn.execute("PRAGMA table_info(transcription_history)").fetchall()}
-        if "title" in cols:
-            rows = conn.execute(
-                """
-                SELECT id, job_id, source_name, title, output_dir, created_at
-                FROM transcription_history
-                ORDER BY id DESC
-                LIMIT ?
-                """,
-                (limit,),
-            ).fetchall()
-            return [
-                TranscriptionHistoryItem(
-                    id=int(row[0]),
-                    job_id=str(row[1]),
-                    source_name=str(row[2]),
-                    title=str(row[3] or ""),
-                    output_dir=str(row[4]),
-                    created_at=str(row[5]),
-                )
-                for row in rows
-            ]
         rows = conn.execute(
             """
-            SELECT id, job_id, source_name, output_dir, created_at
+            SELECT id, job_id, source_name, title, output_dir, created_at
             FROM transcription_history
             ORDER BY id DESC
             LIMIT ?
@@ -424,54 +498,72 @@ def list_transcription_history(db_path: Path, limit: int = 50) -> List[Transcrip
             id=int(row[0]),
             job_id=str(row[1]),
             source_name=str(row[2]),
-            title=str(row[2]),
-            output_dir=str(row[3]),
-            created_at=str(row[4]),
+            title=str(row[3] or ""),
+            output_dir=str(row[4]),
+            created_at=str(row[5]),
         )
         for row in rows
     ]
 
 
+def list_transcription_history_json(db_path: Path, limit: int = 50) -> str:
+    limit = max(1, min(int(limit), 300))
+    return _history_json_array(
+        db_path,
+        """
+        SELECT json_group_array(
+            json_object(
+                'id', id, 'job_id', job_id, 'source_name', source_name, 'title', title,
+                'output_dir', output_dir, 'created_at', created_at
+            )
+        )
+        FROM (SELECT * FROM transcription_history ORDER BY id DESC LIMIT ?)
+        """,
+        limit,
+    )
+
+
 def get_transcription_history_item(db_path: Path, item_id: int) -> Optional[TranscriptionHistoryItem]:
     with open_db(db_path) as conn:
-        cols = {str(row[1]) for row in conn.execute("PRAGMA table_info(transcription_history)").fetchall()}
-        if "title" in cols:
-            row = conn.execute(
-                """
-                SELECT id, job_id, source_name, title, output_dir, created_at
-                FROM transcription_history
-                WHERE id = ?
-                """,
-                (int(item_id),),
-            ).fetchone()
-            if not row:
-                return None
-            return TranscriptionHistoryItem(
-                id=int(row[0]),
-                job_id=str(row[1]),
-                source_name=str(row[2]),
-                title=str(row[3] or ""),
-                output_dir=str(row[4]),
-                created_at=str(row[5]),
-            )
         row = conn.execute(
             """
-            SELECT id, job_id, source_name, output_dir, created_at
+            SELECT id, job_id, source_name, title, output_dir, created_at
             FROM transcription_history
             WHERE id = ?
             """,
             (int(item_id),),
         ).fetchone()
-        if not row:
-            return None
-        return TranscriptionHistoryItem(
-            id=int(row[0]),
-            job_id=str(row[1]),
-            source_name=str(row[2]),
-            title=str(row[2]),
-            output_dir=str(row[3]),
-            created_at=str(row[4]),
-        )
+    if not row:
+        return None
+    return _transcription_history_item(row)
+
+
+def get_transcription_history_by_job(db_path: Path, job_id: str) -> Optional[TranscriptionHistoryItem]:
+    with open_db(db_path) as conn:
+        row = conn.execute(
+            """
+            SELECT id, job_id, source_name, title, output_dir, created_at
+            FROM transcription_history
+            WHERE job_id = ?
+            ORDER BY id DESC
+            LIMIT 1
+            """,
+            (job_id,),
+        ).fetchone()
+    if not row:
+        return None
+    return _transcription_history_item(row)
+
+
+def _transcription_history_item(row: tuple) -> TranscriptionHistoryItem:
+    return TranscriptionHistoryItem(
+        id=int(row[0]),
+        job_id=str(row[1]),
+        source_name=str(row[2]),
+        title=str(row[3] or ""),
+        output_dir=str(row[4]),
+        created_at=str(row[5]),
+    )
 
 
 def delete_transcription_history_item(db_path: Path, item_id: int) -> bool:
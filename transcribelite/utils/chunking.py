@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from itertools import accumulate
 from typing import List
 
 
@@ -8,11 +9,10 @@ def chunk_text_words(
     words_per_chunk: int = 450,
     overlap: int = 60,
 ) -> List[str]:
-    cleaned = " ".join(text.split())
-    if not cleaned:
+    words = text.split()
+    if not words:
         return []
 
-    words = cleaned.split(" ")
     if words_per_chunk <= 0:
         words_per_chunk = 450
     if overlap < 0:
@@ -20,14 +20,18 @@ def chunk_text_words(
     if overlap >= words_per_chunk:
         overlap = max(0, words_per_chunk // 4)
 
+    # Join once and slice chunks out by word offsets instead of re-joining overlapping
+    # word lists: bounds[i] is where word i starts, bounds[i + 1] - 1 where it ends.
+    cleaned = " ".join(words)
+    bounds = [0]
+    bounds.extend(accumulate(len(word) + 1 for word in words))
+
+    total = len(words)
     step = max(1, words_per_chunk - overlap)
     chunks: List[str] = []
-    for start in range(0, len(words), step):
-        end = min(len(words), start + words_per_chunk)
-        chunk = " ".join(words[start:end]).strip()
-        if chunk:
-            chunks.append(chunk)
-        if end >= len(words):
+    for start in range(0, total, step):
+        end = min(total, start + words_per_chunk)
+        chunks.append(cleaned[bounds[start] : bounds[end] - 1])
+        if end >= total:
             break
     return chunks
-
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 import hashlib
+import os
 from pathlib import Path
 
 
 def file_identity_hash(file_path: Path) -> str:
-    stat = file_path.stat()
-    payload = f"{file_path.resolve()}|{stat.st_size}|{int(stat.st_mtime)}".encode(
+    path_str = os.fspath(file_path)
+    stat = os.stat(path_str)
+    # abspath is pure string work; resolve() would stat every parent to follow symlinks.
+    payload = f"{os.path.abspath(path_str)}|{stat.st_size}|{int(stat.st_mtime)}".encode(
         "utf-8"
     )
     return hashlib.sha256(payload).hexdigest()[:16]
-
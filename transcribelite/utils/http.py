@@ -1,9 +1,46 @@
 from __future__ import annotations
 
+import random
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+
+# Enough pooled connections for concurrent summary chunks against one host.
+HTTP_POOL_MAXSIZE = 8
+
+# Transient server-side statuses worth retrying; other 4xx fail immediately.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+BACKOFF_BASE_S = 0.5
+BACKOFF_CAP_S = 8.0
+
+# Connect timeout is kept short so an unreachable host fails in seconds, not after the full
+# read timeout; slightly above 3 s to survive one lost TCP SYN.
+CONNECT_TIMEOUT_S = 3.05
+
+_SESSION: Optional[requests.Session] = None
+
+
+def http_session() -> requests.Session:
+    # Shared keep-alive session: repeated Ollama calls reuse TCP/TLS connections.
+    global _SESSION
+    if _SESSION is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_MAXSIZE)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _SESSION = session
+    return _SESSION
+
+
+def http_timeout(read_timeout_s: float) -> Tuple[float, float]:
+    return min(CONNECT_TIMEOUT_S, read_timeout_s), read_timeout_s
+
+
+def backoff_delay(attempt: int, base_s: float = BACKOFF_BASE_S, cap_s: float = BACKOFF_CAP_S) -> float:
+    # Capped exponential backoff with +-20% jitter so concurrent retries spread out.
+    return min(cap_s, base_s * (2 ** attempt)) * random.uniform(0.8, 1.2)
 
 
 def request_json(
@@ -11,21 +48,29 @@ def request_json(
     url: str,
     timeout_s: int = 30,
     retries: int = 2,
-    backoff_s: float = 0.8,
+    backoff_s: float = BACKOFF_BASE_S,
     **kwargs: Any,
 ) -> Dict[str, Any]:
     last_exc: Optional[Exception] = None
     for attempt in range(retries + 1):
         try:
-            response = requests.request(method, url, timeout=timeout_s, **kwargs)
+            response = http_session().request(method, url, timeout=http_timeout(timeout_s), **kwargs)
             response.raise_for_status()
             if response.text.strip():
                 return response.json()
             return {}
-        except Exception as exc:  # noqa: BLE001
+        except (requests.ConnectionError, requests.Timeout) as exc:
             last_exc = exc
-            if attempt >= retries:
+        except requests.HTTPError as exc:
+            last_exc = exc
+            if exc.response is None or exc.response.status_code not in RETRY_STATUSES:
                 break
-            time.sleep(backoff_s * (attempt + 1))
+        except Exception as exc:  # noqa: BLE001
+            # Malformed bodies and the like will not fix themselves on retry.
+            last_exc = exc
+            break
+        if attempt >= retries:
+            break
+        time.sleep(backoff_delay(attempt, base_s=backoff_s))
     raise RuntimeError(f"HTTP request failed: {method} {url}") from last_exc
 
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional
+
+
+def llm_cache_key(*parts: str) -> str:
+    hasher = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        hasher.update(part.encode("utf-8"))
+        # Separator byte keeps ("ab", "c") and ("a", "bc") distinct.
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+def llm_cache_get(cache_dir: Path, key: str) -> Optional[str]:
+    try:
+        return (cache_dir / "llm" / f"{key}.txt").read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+
+def llm_cache_put(cache_dir: Path, key: str, value: str) -> None:
+    target_dir = cache_dir / "llm"
+    try:
+        target_dir.mkdir(parents=True, exist_ok=True)
+        tmp = target_dir / f"{key}.{os.getpid()}.tmp"
+        tmp.write_text(value, encoding="utf-8")
+        os.replace(tmp, target_dir / f"{key}.txt")
+    except OSError:
+        # The cache is best-effort; a read-only cache dir must not fail the run.
+        pass
@@ -16,8 +16,9 @@ def setup_logging(log_file: Path) -> logging.Logger:
     )
     formatter_console = logging.Formatter("%(levelname)s: %(message)s")
 
+    # delay=True: the log file is only opened once something is actually written.
     file_handler = RotatingFileHandler(
-        log_file, maxBytes=5 * 1024 * 1024, backupCount=3, encoding="utf-8"
+        log_file, maxBytes=5 * 1024 * 1024, backupCount=3, encoding="utf-8", delay=True
     )
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(formatter_file)
@@ -1,17 +1,22 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterable
 
 
+@lru_cache(maxsize=256)
+def _resolve(base_dir: str, value: str) -> Path:
+    return (Path(base_dir) / value).resolve()
+
+
 def resolve_path(base_dir: Path, value: str) -> Path:
     candidate = Path(value)
     if candidate.is_absolute():
         return candidate
-    return (base_dir / candidate).resolve()
+    return _resolve(str(base_dir), value)
 
 
 def ensure_dirs(paths: Iterable[Path]) -> None:
     for path in paths:
         path.mkdir(parents=True, exist_ok=True)
-
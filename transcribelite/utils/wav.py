@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+WAV_HEADER_PROBE_BYTES = 4096
+
+
+@dataclass
+class WavHeader:
+    channels: int
+    sample_rate: int
+    byte_rate: int
+    bits_per_sample: int
+    data_offset: int
+    data_size: int
+
+    @property
+    def duration_s(self) -> float:
+        return float(self.data_size) / float(self.byte_rate)
+
+
+def read_pcm_wav_header(wav_path: Path) -> Optional[WavHeader]:
+    # Parses plain PCM RIFF headers from one mmap'd page; returns None for anything else
+    # (extensible/float formats, streamed sizes) so callers can fall back to `wave`/decoders.
+    fd = os.open(str(wav_path), os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        size = os.fstat(fd).st_size
+        if size < 12:
+            return None
+        with mmap.mmap(fd, min(size, WAV_HEADER_PROBE_BYTES), access=mmap.ACCESS_READ) as mm:
+            if mm[0:4] != b"RIFF" or mm[8:12] != b"WAVE":
+                return None
+            fmt: Optional[tuple] = None
+            offset = 12
+            while offset + 8 <= len(mm):
+                chunk_id = mm[offset : offset + 4]
+                (chunk_size,) = struct.unpack_from("<I", mm, offset + 4)
+                body = offset + 8
+                if chunk_id == b"fmt ":
+                    if body + 16 > len(mm):
+                        return None
+                    fmt = struct.unpack_from("<HHIIHH", mm, body)
+                    if fmt[0] != 1:
+                        return None
+                elif chunk_id == b"data":
+                    if fmt is None or not fmt[3] or chunk_size in (0, 0xFFFFFFFF):
+                        return None
+                    _, channels, sample_rate, byte_rate, _, bits = fmt
+                    return WavHeader(
+                        channels=channels,
+                        sample_rate=sample_rate,
+                        byte_rate=byte_rate,
+                        bits_per_sample=bits,
+                        data_offset=body,
+                        data_size=min(chunk_size, size - body),
+                    )
+                offset = body + chunk_size + (chunk_size & 1)
+    finally:
+        os.close(fd)
+    return None
@@ -1,29 +1,54 @@
 ﻿from __future__ import annotations
 
 import asyncio
+import codecs
 import difflib
+import errno
 import io
 import json
+import logging
+import mmap
 import os
 import re
+import secrets
 import shutil
 import subprocess
-import sys
-import uuid
+import tempfile
+import threading
+import time
 import zipfile
 from urllib.parse import quote, urlparse
-from dataclasses import asdict, dataclass
-from datetime import datetime
+from collections import deque
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, BinaryIO, Callable, Deque, Dict, Iterator, List, Optional
 
 from fastapi import FastAPI, File, Form, HTTPException, Query, Request, UploadFile, WebSocket, WebSocketDisconnect
-from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, RedirectResponse, StreamingResponse
+from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse, Response, StreamingResponse
+from fastapi.responses import JSONResponse as _BaseJSONResponse
 from fastapi.staticfiles import StaticFiles
+
+try:
+    # Optional: faster JSON parsing/serialization for transcript files and API responses.
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Optional: C implementation of the same 2*M/T similarity, much faster than difflib.
+    from rapidfuzz.fuzz import ratio as _rf_ratio
+except ImportError:
+    _rf_ratio = None
+
+from transcribelite.app import apply_profile_override, transcribe_media
 from transcribelite.config import load_config
-from transcribelite.pipeline.export import export_outputs
+from transcribelite.pipeline.export import ExportedTranscript, export_transcript
+from transcribelite.pipeline.ingest import decode_pcm, decode_pcm_av, pcm_s16le_to_float32
+from transcribelite.pipeline.stt_faster_whisper import compute_attempts, get_model
 from transcribelite.pipeline.summarize_ollama import check_ollama_health, ensure_model_available, generate_text
-from transcribelite.pipeline.summarize_ollama import list_ollama_models_detailed
+from transcribelite.pipeline.summarize_ollama import list_ollama_models_detailed, refresh_ollama_tags
 from transcribelite.pipeline.summarize_ollama import summarize_text
 from transcribelite.search_index import add_dictation_history
 from transcribelite.search_index import add_qa_history
@@ -32,12 +57,15 @@ from transcribelite.search_index import delete_index_for_job
 from transcribelite.search_index import index_job as index_transcript_job
 from transcribelite.search_index import delete_dictation_history_item
 from transcribelite.search_index import delete_transcription_history_item
+from transcribelite.search_index import get_transcription_history_by_job
 from transcribelite.search_index import get_transcription_history_item
-from transcribelite.search_index import list_dictation_history
-from transcribelite.search_index import list_qa_history
-from transcribelite.search_index import list_transcription_history
+from transcribelite.search_index import list_dictation_history_json
+from transcribelite.search_index import list_qa_history_json
+from transcribelite.search_index import list_transcription_history_json
 from transcribelite.search_index import search_chunks
 from transcribelite.search_index import search_global_chunks
+from transcribelite.search_index import write_transaction
+from transcribelite.utils.logging_setup import setup_logging
 
 APP_DIR = Path(__file__).resolve().parent.parent
 UPLOADS_DIR = APP_DIR / "cache" / "uploads"
@@ -55,6 +83,8 @@ OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 DICTATION_DIR.mkdir(parents=True, exist_ok=True)
 STATIC_DIR.mkdir(parents=True, exist_ok=True)
+# Resolved once: the delete guard compares history paths against it.
+OUTPUT_DIR_RESOLVED = OUTPUT_DIR.resolve()
 
 ALLOWED_EXTENSIONS = {
     ".mp3",
@@ -89,13 +119,39 @@ POLISH_NUM_PREDICT = {
     "custom": 350,
 }
 MAX_UPLOAD_BYTES = 1024 * 1024 * 1024  # 1 GB
+UPLOAD_COPY_CHUNK_BYTES = 1024 * 1024
+ZIP_SPOOL_MAX_BYTES = 4 * 1024 * 1024
+ZIP_STORE_MAX_BYTES = 1024 * 1024
+JSON_MMAP_MIN_BYTES = 1024 * 1024
+PREVIEW_EXCERPT_CHARS = 6000
+# Output files only come in these flavours; saves FileResponse a mimetypes guess per download.
+DOWNLOAD_MEDIA_TYPES = {
+    ".md": "text/markdown; charset=utf-8",
+    ".txt": "text/plain; charset=utf-8",
+    ".json": "application/json",
+}
+STATIC_VERSIONED_CACHE_CONTROL = "public, max-age=31536000, immutable"
+ZIP_STREAM_CHUNK_BYTES = 64 * 1024
 MAX_REMOTE_DOWNLOAD_BYTES = 1024 * 1024 * 1024  # 1 GB
 MAX_REMOTE_DURATION_SECONDS = 3 * 60 * 60  # 3 hours
 MAX_JOBS = 100
-
-STAGE_RE = re.compile(r"^\s*(ingest|stt|summarize|export)\s*:\s*([0-9.]+)s", re.I)
-DONE_RE = re.compile(r"done:\s*([0-9.]+)s\s*->\s*(.+)$", re.I)
-SECTION_RE = re.compile(r"(?is)^##\s*([^\n]+)\s*$")
+DICTATION_STEP_INTERVAL_S = 1.1
+DICTATION_TAIL_SECONDS = 10
+# 16 kHz mono s16le, matching the live decoder's output format.
+DICTATION_TAIL_BYTES = DICTATION_TAIL_SECONDS * 16000 * 2
+
+# Share of the progress bar credited when each pipeline stage finishes.
+STAGE_WEIGHTS = {"download": 0.10, "ingest": 0.08, "stt": 0.62, "summarize": 0.15, "export": 0.05}
+# A "## name" heading line (leading/trailing blanks allowed), matched across the whole text.
+SECTION_RE = re.compile(r"^[^\S\n]*##([^\n]*\S[^\n]*)$", re.M)
+_NONWORD_RE = re.compile(r"[^\w\s]+")
+_SLUG_UNSAFE_RE = re.compile(r"[^\w\-]+")
+_UNDERSCORE_RUN_RE = re.compile(r"_+")
+_ASCII_FNAME_UNSAFE_RE = re.compile(r"[^A-Za-z0-9._-]+")
+_PRESET_UNSAFE_RE = re.compile(r"[^a-z0-9_-]+")
+_NON_DIGIT_RE = re.compile(r"[^0-9]")
+# Same character class as _NONWORD_RE restricted to ASCII, for the str.translate fast path.
+_ASCII_NONWORD_TABLE = str.maketrans({chr(c): None for c in range(128) if _NONWORD_RE.match(chr(c))})
 
 
 @dataclass
@@ -112,7 +168,7 @@ class Job:
 
 
 JOBS: Dict[str, Job] = {}
-JOB_ORDER: list[str] = []
+JOB_ORDER: Deque[str] = deque(maxlen=MAX_JOBS)
 
 
 @dataclass
@@ -124,7 +180,6 @@ class DictationSession:
     summarize_enabled: bool
     source_mime: str
     webm_path: Path
-    tail_wav_path: Path
     full_wav_path: Path
     running: bool
     final_text: str
@@ -135,9 +190,18 @@ class DictationSession:
     manual_text_override: bool
     saved_once: bool
     worker: Optional[asyncio.Task]
+    audio_ready: asyncio.Event
+    # Live decoder: one ffmpeg per session fed through stdin; the pump task keeps the
+    # last DICTATION_TAIL_SECONDS of PCM in pcm_tail.
+    decoder: Optional[asyncio.subprocess.Process]
+    decoder_pump: Optional[asyncio.Task]
+    pcm_tail: bytearray
+    # Kept open for the whole recording; unbuffered so ffmpeg fallbacks see every byte.
+    webm_file: Optional[BinaryIO]
 
 
 DICTATION_SESSIONS: Dict[str, DictationSession] = {}
+_MODEL_LOCKS: Dict[int, threading.Lock] = {}
 
 
 @dataclass
@@ -151,16 +215,92 @@ class PullState:
 
 
 OLLAMA_PULLS: Dict[str, PullState] = {}
+# Open /events streams per pull; the _set_pull_* helpers wake them on every change.
+OLLAMA_PULL_WATCHERS: Dict[str, List[asyncio.Event]] = {}
+PULL_EVENTS_KEEPALIVE_S = 15.0
+# One model download at a time; later pulls wait their turn.
+OLLAMA_PULL_SEMAPHORE = asyncio.Semaphore(1)
+# Concurrent Whisper runs contend for the same cores/VRAM and all slow down, so jobs queue up instead.
+MAX_CONCURRENT_TRANSCRIPTIONS = max(1, int(os.environ.get("TRANSCRIBELITE_MAX_JOBS", "1") or 1))
+TRANSCRIBE_SEMAPHORE = asyncio.Semaphore(MAX_CONCURRENT_TRANSCRIPTIONS)
+# The loop only keeps weak references to tasks, so fire-and-forget tasks are pinned here.
+BACKGROUND_TASKS: set[asyncio.Task] = set()
+
+
+@dataclass(frozen=True)
+class PolishPreset:
+    path: Path
+    num_predict: int
+
+
+class JSONResponse(_BaseJSONResponse):
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        return super().render(content)
+
+
+def _load_json_file(path: Path) -> Any:
+    if orjson is not None:
+        with path.open("rb") as f:
+            if os.fstat(f.fileno()).st_size >= JSON_MMAP_MIN_BYTES:
+                # Parse straight from the page cache instead of copying into a bytes object.
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    return orjson.loads(view)
+            return orjson.loads(f.read())
+    return json.loads(path.read_bytes())
+
+
+def _loads_json(data: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+async def _ws_send_json(websocket: WebSocket, payload: Dict[str, Any]) -> None:
+    # Still a text frame, which is what the browser client parses.
+    if orjson is not None:
+        await websocket.send_text(orjson.dumps(payload).decode("utf-8"))
+    else:
+        await websocket.send_json(payload)
+
+
+def _now_iso() -> str:
+    # Same text as datetime.now().isoformat(timespec="seconds"), without building a datetime.
+    lt = time.localtime()
+    return (
+        f"{lt.tm_year:04d}-{lt.tm_mon:02d}-{lt.tm_mday:02d}"
+        f"T{lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d}"
+    )
 
-app = FastAPI(title="TranscribeLite Web", docs_url=None, redoc_url=None)
-app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
+def _now_stamp() -> str:
+    # File-name timestamp, same form as the export folder stamp.
+    return time.strftime("%Y%m%d_%H%M%S")
 
-def _resolve_python_executable() -> str:
-    venv_python = APP_DIR / ".venv" / "Scripts" / "python.exe"
-    if venv_python.exists():
-        return str(venv_python)
-    return sys.executable
+
+def _dump_json(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    return json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+class CachedStaticFiles(StaticFiles):
+    # Versioned URLs (app.js?v=...) change whenever the file does, so the browser may keep
+    # them; everything else is revalidated via the ETag StaticFiles already sends (-> 304).
+    async def get_response(self, path: str, scope: Any) -> Any:
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            query = scope.get("query_string", b"")
+            if any(part.startswith(b"v=") for part in query.split(b"&")):
+                response.headers["Cache-Control"] = STATIC_VERSIONED_CACHE_CONTROL
+            else:
+                response.headers["Cache-Control"] = "no-cache"
+        return response
+
+
+app = FastAPI(title="TranscribeLite Web", docs_url=None, redoc_url=None, default_response_class=JSONResponse)
+app.mount("/static", CachedStaticFiles(directory=str(STATIC_DIR)), name="static")
 
 
 @app.get("/favicon.ico")
@@ -168,14 +308,6 @@ def favicon() -> RedirectResponse:
     return RedirectResponse(url="/static/favicon.svg")
 
 
-def _trim_jobs() -> None:
-    if len(JOB_ORDER) <= MAX_JOBS:
-        return
-    for old_id in JOB_ORDER[MAX_JOBS:]:
-        JOBS.pop(old_id, None)
-    del JOB_ORDER[MAX_JOBS:]
-
-
 def _validate_profile(profile: str) -> str:
     normalized = profile.strip().lower()
     if normalized not in ALLOWED_PROFILES:
@@ -193,7 +325,7 @@ def _is_valid_url(candidate: str) -> bool:
 
 def _create_job(profile: str, filename: str, job_id: Optional[str] = None) -> Job:
     if not job_id:
-        job_id = uuid.uuid4().hex[:12]
+        job_id = secrets.token_hex(6)
     job = Job(
         id=job_id,
         filename=filename,
@@ -206,49 +338,83 @@ def _create_job(profile: str, filename: str, job_id: Optional[str] = None) -> Jo
         error=None,
     )
     JOBS[job_id] = job
-    JOB_ORDER.insert(0, job_id)
-    _trim_jobs()
+    if len(JOB_ORDER) >= MAX_JOBS:
+        # Evict explicitly: the deque's maxlen would drop the id but leave the Job in JOBS.
+        JOBS.pop(JOB_ORDER.pop(), None)
+    JOB_ORDER.appendleft(job_id)
     return job
 
 
-def _find_output_for_input(input_path: Path, started_at: float) -> Optional[str]:
-    resolved_input = str(input_path.resolve())
-    candidates = sorted(OUTPUT_DIR.glob("*"), key=lambda p: p.stat().st_mtime, reverse=True)
-    for out_dir in candidates:
-        try:
-            if out_dir.stat().st_mtime < started_at:
-                continue
-            meta_file = out_dir / "transcript.json"
-            if not meta_file.exists():
-                continue
-            payload = json.loads(meta_file.read_text(encoding="utf-8"))
-            source = str(payload.get("meta", {}).get("source_file", "")).strip()
-            if source and str(Path(source).resolve()) == resolved_input:
-                return str(out_dir)
-        except Exception:
-            continue
-    return None
+def _upload_on_disk(src: Any) -> bool:
+    if isinstance(src, tempfile.SpooledTemporaryFile):
+        # No public API for this: a spool that has not rolled over still holds an in-memory
+        # buffer, and calling fileno() on it would force the rollover we want to avoid.
+        return not isinstance(src._file, (io.BytesIO, io.StringIO))
+    try:
+        src.fileno()
+    except (AttributeError, io.UnsupportedOperation, OSError, ValueError):
+        return False
+    return True
+
+
+def _copy_upload_in_kernel(src: Any, dst: BinaryIO) -> Optional[int]:
+    # Linux only, and only for uploads already on disk. None = use the copy loop.
+    if not hasattr(os, "copy_file_range") or not _upload_on_disk(src):
+        return None
+    try:
+        src_fd = src.fileno()
+        start = src.tell()
+        remaining = os.fstat(src_fd).st_size - start
+    except (AttributeError, OSError, ValueError):
+        return None
+    if remaining > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Uploaded file is too large")
+    copied = 0
+    try:
+        while copied < remaining:
+            n = os.copy_file_range(src_fd, dst.fileno(), remaining - copied, start + copied)
+            if n == 0:
+                break
+            copied += n
+    except OSError as exc:
+        if copied == 0 and exc.errno in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+            return None
+        raise
+    return copied
+
+
+def _save_upload(src: Any, dest: Path) -> int:
+    bytes_written = 0
+    with dest.open("wb") as f:
+        copied = _copy_upload_in_kernel(src, f)
+        if copied is not None:
+            return copied
+        while True:
+            chunk = src.read(UPLOAD_COPY_CHUNK_BYTES)
+            if not chunk:
+                break
+            bytes_written += len(chunk)
+            if bytes_written > MAX_UPLOAD_BYTES:
+                raise HTTPException(status_code=413, detail="Uploaded file is too large")
+            f.write(chunk)
+    return bytes_written
 
 
-def _extract_markdown_section(text: str, section_name: str) -> str:
+def _extract_markdown_sections(text: str) -> Dict[str, str]:
+    # One scan over the headers yields every section; the first heading of a name wins.
+    sections: Dict[str, str] = {}
     if not text:
-        return ""
-    section_name = section_name.strip().lower()
-    lines = text.splitlines()
-    start_idx = -1
-    for i, line in enumerate(lines):
-        match = SECTION_RE.match(line.strip())
-        if match and match.group(1).strip().lower() == section_name:
-            start_idx = i + 1
-            break
-    if start_idx < 0:
-        return ""
-    end_idx = len(lines)
-    for j in range(start_idx, len(lines)):
-        if SECTION_RE.match(lines[j].strip()):
-            end_idx = j
-            break
-    return "\n".join(lines[start_idx:end_idx]).strip()
+        return sections
+    prev_name: Optional[str] = None
+    prev_end = 0
+    for match in SECTION_RE.finditer(text):
+        if prev_name is not None and prev_name not in sections:
+            sections[prev_name] = text[prev_end : match.start()].strip()
+        prev_name = match.group(1).strip().lower()
+        prev_end = match.end()
+    if prev_name is not None and prev_name not in sections:
+        sections[prev_name] = text[prev_end:].strip()
+    return sections
 
 
 def _extract_bullets(text: str) -> list[str]:
@@ -280,8 +446,8 @@ def _short_source_text(text: str, max_chars: int = 360) -> str:
 
 
 def _safe_slug(value: str, max_len: int = 64) -> str:
-    slug = re.sub(r"[^\w\-]+", "_", str(value or ""), flags=re.UNICODE).strip("_")
-    slug = re.sub(r"_+", "_", slug)
+    slug = _SLUG_UNSAFE_RE.sub("_", str(value or "")).strip("_")
+    slug = _UNDERSCORE_RUN_RE.sub("_", slug)
     if len(slug) > max_len:
         slug = slug[:max_len].rstrip("_")
     return slug or "transcription"
@@ -290,7 +456,7 @@ def _safe_slug(value: str, max_len: int = 64) -> str:
 def _ascii_filename(value: str, max_len: int = 120) -> str:
     cleaned = str(value or "").strip().replace("\r", " ").replace("\n", " ")
     cleaned = cleaned.encode("ascii", "ignore").decode("ascii")
-    cleaned = re.sub(r"[^A-Za-z0-9._-]+", "_", cleaned).strip("._")
+    cleaned = _ASCII_FNAME_UNSAFE_RE.sub("_", cleaned).strip("._")
     if len(cleaned) > max_len:
         cleaned = cleaned[:max_len].rstrip("._")
     return cleaned or "download.zip"
@@ -303,18 +469,42 @@ def _build_content_disposition(filename: str) -> str:
     return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{encoded}"
 
 
-def _build_transcription_zip(output_dir: Path) -> bytes:
+def _build_transcription_zip(output_dir: Path) -> BinaryIO:
     note = output_dir / "note.md"
     txt = output_dir / "transcript.txt"
     if not note.exists() or not txt.exists():
         raise FileNotFoundError("Required files are missing in output directory")
 
-    buf = io.BytesIO()
-    with zipfile.ZipFile(buf, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
-        zf.write(note, arcname="note.md")
-        zf.write(txt, arcname="transcript.txt")
+    # Small archives stay in memory; large transcripts roll over to a temp file
+    # instead of being held (and copied) as one bytes object.
+    # Text transcripts are small: storing skips zlib entirely; larger ones use the
+    # fastest deflate level, which keeps most of the ratio at a fraction of level 6's CPU.
+    total_size = note.stat().st_size + txt.stat().st_size
+    if total_size < ZIP_STORE_MAX_BYTES:
+        compression, level = zipfile.ZIP_STORED, None
+    else:
+        compression, level = zipfile.ZIP_DEFLATED, 1
+    buf = tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_MAX_BYTES)
+    try:
+        with zipfile.ZipFile(buf, mode="w", compression=compression, compresslevel=level) as zf:
+            zf.write(note, arcname="note.md")
+            zf.write(txt, arcname="transcript.txt")
+    except Exception:
+        buf.close()
+        raise
     buf.seek(0)
-    return buf.getvalue()
+    return buf
+
+
+def _iter_file_chunks(fh: BinaryIO, chunk_size: int = ZIP_STREAM_CHUNK_BYTES) -> Iterator[bytes]:
+    try:
+        while True:
+            chunk = fh.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        fh.close()
 
 
 def _read_transcript_meta(out_dir: Path) -> dict:
@@ -322,7 +512,7 @@ def _read_transcript_meta(out_dir: Path) -> dict:
     if not path.exists():
         return {}
     try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
+        payload = _load_json_file(path)
         meta = payload.get("meta", {})
         return meta if isinstance(meta, dict) else {}
     except Exception:
@@ -344,9 +534,10 @@ def _ollama_error_status(message: str) -> int:
     return 503
 
 
-def _read_prompt_file(path: Path) -> str:
-    if not path.exists():
-        raise HTTPException(status_code=500, detail=f"Missing prompt file: {path}")
+# Keyed on mtime so an edited prompt file is re-read on the next request.
+@lru_cache(maxsize=64)
+def _read_prompt_cached(path_str: str, mtime_ns: int) -> str:
+    path = Path(path_str)
     for enc in ("utf-8", "utf-8-sig", "cp1251"):
         try:
             return path.read_text(encoding=enc)
@@ -355,25 +546,40 @@ def _read_prompt_file(path: Path) -> str:
     raise HTTPException(status_code=500, detail=f"Unable to read prompt file: {path}")
 
 
-def _discover_polish_preset_files() -> dict[str, Path]:
-    presets: dict[str, Path] = {}
-    if not POLISH_PROMPTS_DIR.exists():
-        return presets
+def _read_prompt_file(path: Path) -> str:
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        raise HTTPException(status_code=500, detail=f"Missing prompt file: {path}")
+    return _read_prompt_cached(str(path), mtime_ns)
+
 
+# Keyed on the directory mtime, which changes whenever a preset file is added, removed or renamed.
+@lru_cache(maxsize=4)
+def _discover_polish_presets_cached(dir_mtime_ns: int) -> Dict[str, PolishPreset]:
+    presets: Dict[str, PolishPreset] = {}
     for path in POLISH_PROMPTS_DIR.glob("*.txt"):
         name = path.stem.strip().lower()
         if name == "base_strict_ru":
             continue
         preset = name[:-3] if name.endswith("_ru") else name
-        preset = re.sub(r"[^a-z0-9_-]+", "", preset)
+        preset = _PRESET_UNSAFE_RE.sub("", preset)
         if not preset:
             continue
-        presets[preset] = path
+        presets[preset] = PolishPreset(path=path, num_predict=POLISH_NUM_PREDICT.get(preset, 350))
     return presets
 
 
+def _discover_polish_presets() -> Dict[str, PolishPreset]:
+    try:
+        dir_mtime_ns = POLISH_PROMPTS_DIR.stat().st_mtime_ns
+    except OSError:
+        return {}
+    return _discover_polish_presets_cached(dir_mtime_ns)
+
+
 def _build_polish_presets_payload() -> list[dict[str, Any]]:
-    discovered = _discover_polish_preset_files()
+    discovered = _discover_polish_presets()
     ordered_ids = [p for p in POLISH_PRESET_ORDER if p in discovered]
     extra_ids = sorted([p for p in discovered.keys() if p not in ordered_ids])
     all_ids = ordered_ids + extra_ids
@@ -438,8 +644,8 @@ def _save_polish_result(
     target_path = out_dir / target_name
     target_path.write_text(polished_text, encoding="utf-8")
 
-    created_at = datetime.now().isoformat(timespec="seconds")
-    meta_path = out_dir / f"polish_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    created_at = _now_iso()
+    meta_path = out_dir / f"polish_{_now_stamp()}.json"
     meta_payload = {
         "preset": preset,
         "instruction": instruction,
@@ -450,7 +656,7 @@ def _save_polish_result(
         "format": "markdown" if is_markdown else "text",
         "saved_path": str(target_path),
     }
-    meta_path.write_text(json.dumps(meta_payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    meta_path.write_bytes(_dump_json(meta_payload))
     return str(target_path), ("markdown" if is_markdown else "text")
 
 
@@ -463,12 +669,35 @@ async def _read_polish_payload(request: Request) -> dict:
     return {k: form.get(k) for k in form.keys()}
 
 
+@lru_cache(maxsize=None)
+def _field_names(cls: type) -> tuple[str, ...]:
+    return tuple(f.name for f in fields(cls))
+
+
+def _flat_dict(obj: Any) -> Dict[str, Any]:
+    # Job/PullState hold only scalars, so asdict()'s recursive deep copy is wasted work.
+    return {name: getattr(obj, name) for name in _field_names(type(obj))}
+
+
+def _spawn_background(coro: Any) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    BACKGROUND_TASKS.add(task)
+    task.add_done_callback(BACKGROUND_TASKS.discard)
+    return task
+
+
+def _notify_pull_watchers(pull_id: str) -> None:
+    for changed in OLLAMA_PULL_WATCHERS.get(pull_id, ()):
+        changed.set()
+
+
 def _set_pull_message(pull_id: str, message: str) -> None:
     state = OLLAMA_PULLS.get(pull_id)
     if not state:
         return
     state.message = message
     state.status = "running"
+    _notify_pull_watchers(pull_id)
 
 
 def _set_pull_done(pull_id: str, message: str) -> None:
@@ -479,6 +708,7 @@ def _set_pull_done(pull_id: str, message: str) -> None:
     state.status = "done"
     state.message = message
     state.error = None
+    _notify_pull_watchers(pull_id)
 
 
 def _set_pull_error(pull_id: str, error: str) -> None:
@@ -489,45 +719,56 @@ def _set_pull_error(pull_id: str, error: str) -> None:
     state.status = "error"
     state.error = error
     state.message = "failed"
+    _notify_pull_watchers(pull_id)
 
 
-def _index_completed_job(job_id: str, out_dir: Path) -> None:
-    txt_path = out_dir / "transcript.txt"
-    json_path = out_dir / "transcript.json"
-    if not txt_path.exists():
-        return
-    transcript_text = txt_path.read_text(encoding="utf-8").strip()
+def _index_completed_job(conn: Any, job_id: str, exported: ExportedTranscript) -> None:
+    # Everything comes from the export result in memory; nothing is re-read from out_dir.
+    transcript_text = exported.transcript_text.strip()
     if not transcript_text:
         return
 
-    title = out_dir.name
-    created_at = datetime.now().isoformat(timespec="seconds")
-    if json_path.exists():
-        try:
-            payload = json.loads(json_path.read_text(encoding="utf-8"))
-            meta = payload.get("meta", {})
-            title_meta = str(meta.get("title", "")).strip()
-            if title_meta:
-                title = title_meta
-            source_file = str(meta.get("source_file", "")).strip()
-            if source_file and not title_meta:
-                title = Path(source_file).name
-            created = str(meta.get("created_at", "")).strip()
-            if created:
-                created_at = created
-        except Exception:
-            pass
-
+    title = exported.title.strip() or Path(exported.source_file).name or exported.out_dir.name
     index_transcript_job(
         db_path=INDEX_DB_PATH,
         job_id=job_id,
         title=title,
         transcript_text=transcript_text,
-        output_dir=str(out_dir),
-        created_at=created_at,
+        output_dir=str(exported.out_dir),
+        created_at=exported.created_at or _now_iso(),
+        conn=conn,
     )
 
 
+def _record_transcription_job(job_id: str, exported: ExportedTranscript, filename: str) -> None:
+    # The FTS index and the history row share one commit.
+    title = (exported.title or Path(filename).stem).strip()
+    with write_transaction(INDEX_DB_PATH) as conn:
+        _index_completed_job(conn, job_id, exported)
+        add_transcription_history(
+            INDEX_DB_PATH,
+            job_id,
+            Path(filename).name,
+            title,
+            str(exported.out_dir),
+            _now_iso(),
+            conn=conn,
+        )
+
+
+def _record_dictation_job(job_id: str, exported: ExportedTranscript) -> None:
+    with write_transaction(INDEX_DB_PATH) as conn:
+        _index_completed_job(conn, job_id, exported)
+        add_dictation_history(
+            db_path=INDEX_DB_PATH,
+            job_id=job_id,
+            output_dir=str(exported.out_dir),
+            text_preview=_build_dictation_preview(exported.transcript_text),
+            created_at=_now_iso(),
+            conn=conn,
+        )
+
+
 def _resolve_profile_for_cfg(cfg: Any, profile: str) -> str:
     p = profile.strip().lower()
     if p == "auto":
@@ -551,38 +792,18 @@ def _build_cfg_for_dictation(profile: str, language: str, summarize_enabled: boo
     return cfg
 
 
-def _resolve_device_and_compute(preferred_device: str, preferred_compute: str) -> tuple[str, str]:
-    device = preferred_device.lower()
-    compute_type = preferred_compute
-    if device != "cuda":
-        return "cpu", "int8" if compute_type == "float16" else compute_type
-    try:
-        import torch  # type: ignore
-
-        if torch.cuda.is_available():
-            return "cuda", compute_type
-    except Exception:
-        pass
-    return "cpu", "int8"
-
-
 def _init_dictation_model(cfg: Any) -> tuple[Any, str, str]:
-    from faster_whisper import WhisperModel
-
-    device, compute_type = _resolve_device_and_compute(cfg.stt.device, cfg.stt.compute_type)
-    attempts = [(device, compute_type)]
-    if device == "cuda" and compute_type != "float32":
-        attempts.append(("cuda", "float32"))
-    attempts.append(("cpu", "int8"))
+    # Dictation is latency-bound: start from the quantized ladder (int8_float16 on CUDA,
+    # int8 on CPU) even when the profile asks for float32, then any other configured type.
+    attempts = compute_attempts(cfg.stt.device, "auto")
+    attempts += [a for a in compute_attempts(cfg.stt.device, cfg.stt.compute_type) if a not in attempts]
 
     last_exc: Optional[Exception] = None
     for d, c in attempts:
         try:
-            model = WhisperModel(
-                cfg.stt.model_name,
-                device=d,
-                compute_type=c,
-                download_root=str(cfg.paths.models_dir),
+            # Sessions share the process-wide model cache instead of loading their own copy.
+            model = get_model(
+                cfg.stt.model_name, d, c, str(cfg.paths.models_dir), cache_size=cfg.stt.model_cache_size
             )
             return model, d, c
         except Exception as exc:
@@ -590,75 +811,139 @@ def _init_dictation_model(cfg: Any) -> tuple[Any, str, str]:
     raise RuntimeError("Unable to initialize dictation model") from last_exc
 
 
-def _ffmpeg_decode_tail(ffmpeg_path: str, input_path: Path, output_wav: Path, tail_seconds: int = 10) -> None:
-    cmd_tail = [
-        ffmpeg_path,
-        "-y",
-        "-sseof",
-        f"-{tail_seconds}",
-        "-i",
-        str(input_path),
-        "-ac",
-        "1",
-        "-ar",
-        "16000",
-        str(output_wav),
-    ]
+def _ffmpeg_decode_tail(ffmpeg_path: str, input_path: Path, tail_seconds: int = 10) -> Any:
     try:
-        subprocess.run(cmd_tail, capture_output=True, text=True, check=True)
-        return
+        return decode_pcm_av(input_path, tail_seconds=tail_seconds)
+    except Exception:
+        pass
+
+    try:
+        return decode_pcm(input_path, ffmpeg_path, tail_seconds=tail_seconds)
     except Exception:
         pass
 
     # Fallback for growing/incomplete webm where -sseof can fail intermittently.
-    cmd_full = [
-        ffmpeg_path,
-        "-y",
-        "-i",
-        str(input_path),
-        "-ac",
-        "1",
-        "-ar",
-        "16000",
-        str(output_wav),
-    ]
-    subprocess.run(cmd_full, capture_output=True, text=True, check=True)
-
-
-def _ffmpeg_decode_full(ffmpeg_path: str, input_path: Path, output_wav: Path) -> None:
-    cmd = [
-        ffmpeg_path,
-        "-y",
-        "-i",
-        str(input_path),
-        "-ac",
-        "1",
-        "-ar",
-        "16000",
-        str(output_wav),
-    ]
-    subprocess.run(cmd, capture_output=True, text=True, check=True)
+    return decode_pcm(input_path, ffmpeg_path)
+
+
+def _ffmpeg_decode_full(ffmpeg_path: str, input_path: Path) -> Any:
+    return decode_pcm(input_path, ffmpeg_path)
 
 
-def _transcribe_with_session_model(session: DictationSession, wav_path: Path) -> tuple[list[dict[str, object]], str, Any]:
+async def _start_dictation_decoder(session: DictationSession) -> None:
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            session.cfg.paths.ffmpeg_path,
+            "-loglevel",
+            "error",
+            "-i",
+            "pipe:0",
+            "-vn",
+            "-ac",
+            "1",
+            "-ar",
+            "16000",
+            "-f",
+            "s16le",
+            "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+    except Exception:
+        # Steps fall back to decoding the tail of the webm file.
+        return
+    session.decoder = proc
+    session.decoder_pump = asyncio.create_task(_pump_dictation_pcm(session, proc))
+
+
+async def _pump_dictation_pcm(session: DictationSession, proc: asyncio.subprocess.Process) -> None:
+    assert proc.stdout is not None
+    buf = session.pcm_tail
+    while True:
+        chunk = await proc.stdout.read(64 * 1024)
+        if not chunk:
+            break
+        buf.extend(chunk)
+        excess = len(buf) - DICTATION_TAIL_BYTES
+        if excess > 0:
+            # Trim an even byte count so the buffer stays aligned to int16 samples.
+            del buf[: excess + (excess & 1)]
+    if session.decoder is proc:
+        session.decoder = None
+
+
+async def _feed_dictation_decoder(session: DictationSession, data: bytes) -> None:
+    proc = session.decoder
+    if proc is None or proc.stdin is None:
+        return
+    try:
+        proc.stdin.write(data)
+        await proc.stdin.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        session.decoder = None
+
+
+async def _stop_dictation_decoder(session: DictationSession) -> None:
+    proc = session.decoder
+    session.decoder = None
+    if proc is not None:
+        if proc.returncode is None:
+            proc.kill()
+        try:
+            await proc.wait()
+        except Exception:
+            pass
+    if session.decoder_pump is not None:
+        session.decoder_pump.cancel()
+        try:
+            await session.decoder_pump
+        except BaseException:
+            pass
+        session.decoder_pump = None
+
+
+def _close_webm_file(session: DictationSession) -> None:
+    if session.webm_file is not None:
+        session.webm_file.close()
+        session.webm_file = None
+
+
+def _live_tail_audio(session: DictationSession) -> Any:
+    if session.decoder is None or not session.pcm_tail:
+        return None
+    buf = session.pcm_tail
+    return pcm_s16le_to_float32(bytes(buf[: len(buf) & ~1]))
+
+
+def _transcribe_with_session_model(session: DictationSession, audio: Any) -> tuple[list[dict[str, object]], str, Any]:
     language = None if session.cfg.stt.language.lower() == "auto" else session.cfg.stt.language
-    segments_iter, info = session.model.transcribe(
-        str(wav_path),
-        language=language,
-        task="transcribe",
-        beam_size=session.cfg.stt.beam_size,
-        vad_filter=session.cfg.stt.vad_filter,
-    )
-    segments: list[dict[str, object]] = []
-    text_parts: list[str] = []
-    for seg in segments_iter:
-        part = seg.text.strip()
-        if part:
-            text_parts.append(part)
-        segments.append({"start": float(seg.start), "end": float(seg.end), "text": part})
+    # The model may be shared with other sessions; run one decode at a time per model.
+    # Segments are generated lazily, so the whole loop stays under the lock.
+    with _MODEL_LOCKS.setdefault(id(session.model), threading.Lock()):
+        segments_iter, info = session.model.transcribe(
+            audio,
+            language=language,
+            task="transcribe",
+            beam_size=session.cfg.stt.beam_size,
+            vad_filter=session.cfg.stt.vad_filter,
+        )
+        segments: list[dict[str, object]] = []
+        text_parts: list[str] = []
+        for seg in segments_iter:
+            part = seg.text.strip()
+            if part:
+                text_parts.append(part)
+            segments.append({"start": float(seg.start), "end": float(seg.end), "text": part})
     return segments, " ".join(text_parts).strip(), info
 
 
+def _similarity(a: str, b: str) -> float:
+    if _rf_ratio is not None:
+        return _rf_ratio(a, b) / 100.0
+    return difflib.SequenceMatcher(None, a, b).ratio()
+
+
 def _merge_by_overlap_words(base_text: str, new_text: str, max_overlap_words: int = 80) -> str:
     base_words = base_text.split()
     new_words = new_text.split()
@@ -672,7 +957,7 @@ def _merge_by_overlap_words(base_text: str, new_text: str, max_overlap_words: in
     tail_text = " ".join(base_words[-max(25, len(new_words) + 12) :])
     tail_norm = _normalize_for_compare(tail_text)
     if new_norm and tail_norm:
-        ratio = difflib.SequenceMatcher(None, tail_norm, new_norm).ratio()
+        ratio = _similarity(tail_norm, new_norm)
         if ratio >= 0.88:
             return base_text
 
@@ -682,13 +967,15 @@ def _merge_by_overlap_words(base_text: str, new_text: str, max_overlap_words: in
         if new_norm and new_norm in base_tail_norm:
             return base_text
 
-    # Exact overlap on normalized words to append only delta.
-    base_norm_words = _normalize_for_compare(base_text).split()
-    new_norm_words = _normalize_for_compare(new_text).split()
+    # Exact overlap on normalized words to append only delta. Only the last max_k
+    # normalized words of the transcript can overlap, so normalize just that tail
+    # instead of the whole (growing) text on every dictation tick.
+    max_k = min(max_overlap_words, len(base_words), len(new_words))
+    base_norm_words = _normalized_tail_words(base_words, max_k)
+    new_norm_words = new_norm.split()
     if not base_norm_words or not new_norm_words:
         return (base_text + " " + new_text).strip()
 
-    max_k = min(max_overlap_words, len(base_words), len(new_words))
     overlap = 0
     for k in range(max_k, 0, -1):
         if base_norm_words[-k:] == new_norm_words[:k]:
@@ -701,10 +988,27 @@ def _merge_by_overlap_words(base_text: str, new_text: str, max_overlap_words: in
     return (base_text + " " + " ".join(delta_words)).strip()
 
 
+def _normalized_tail_words(words: list[str], count: int) -> list[str]:
+    # Normalization never splits or joins words, only empties some of them, so the
+    # tail of the normalized text equals the last non-empty normalized words.
+    tail: list[str] = []
+    for word in reversed(words):
+        if len(tail) >= count:
+            break
+        norm = _normalize_for_compare(word)
+        if norm:
+            tail.append(norm)
+    tail.reverse()
+    return tail
+
+
 def _normalize_for_compare(text: str) -> str:
-    normalized = re.sub(r"[^\w\s]+", "", text.lower(), flags=re.UNICODE)
-    normalized = re.sub(r"\s+", " ", normalized).strip()
-    return normalized
+    lowered = text.lower()
+    if lowered.isascii():
+        stripped = lowered.translate(_ASCII_NONWORD_TABLE)
+    else:
+        stripped = _NONWORD_RE.sub("", lowered)
+    return " ".join(stripped.split())
 
 
 def _delta_from_previous_chunk(previous_chunk: str, current_chunk: str, max_overlap_words: int = 60) -> str:
@@ -723,7 +1027,7 @@ def _delta_from_previous_chunk(previous_chunk: str, current_chunk: str, max_over
         return ""
 
     # Same fragment with minor punctuation/case changes: do not append duplicates.
-    sim = difflib.SequenceMatcher(None, prev_norm, curr_norm).ratio()
+    sim = _similarity(prev_norm, curr_norm)
     if sim >= 0.92:
         return ""
 
@@ -749,24 +1053,28 @@ def _delta_from_previous_chunk(previous_chunk: str, current_chunk: str, max_over
 
 
 def _build_dictation_preview(text: str, max_chars: int = 420) -> str:
-    compact = re.sub(r"\s+", " ", text.strip())
+    words = text.split()
+    compact = " ".join(words)
     if not compact:
         return ""
     # Insert soft line breaks for readability in history cards.
-    words = compact.split()
     lines: list[str] = []
+    lines_len = 0
     current: list[str] = []
     current_len = 0
     for w in words:
         add = len(w) + (1 if current else 0)
         if current and current_len + add > 85:
-            lines.append(" ".join(current))
+            line = " ".join(current)
+            lines.append(line)
+            lines_len += len(line)
             current = [w]
             current_len = len(w)
         else:
             current.append(w)
             current_len += add
-        if sum(len(line) for line in lines) + len(" ".join(current)) >= max_chars:
+        # current_len always equals len(" ".join(current)).
+        if lines_len + current_len >= max_chars:
             break
     if current:
         lines.append(" ".join(current))
@@ -778,10 +1086,16 @@ def _build_dictation_preview(text: str, max_chars: int = 420) -> str:
 
 async def _dictation_worker(websocket: WebSocket, session_id: str) -> None:
     while True:
-        await asyncio.sleep(1.1)
+        # The sleep paces steps; appends that land meanwhile coalesce into one decode.
+        await asyncio.sleep(DICTATION_STEP_INTERVAL_S)
         session = DICTATION_SESSIONS.get(session_id)
         if not session or not session.running:
             return
+        # Without new audio the tail is unchanged, so wait instead of re-running ffmpeg/STT.
+        await session.audio_ready.wait()
+        session.audio_ready.clear()
+        if not session.running:
+            return
         await _dictation_step(websocket, session)
 
 
@@ -789,15 +1103,16 @@ async def _dictation_step(websocket: WebSocket, session: DictationSession) -> No
     if not session.webm_path.exists() or session.webm_path.stat().st_size < 2048:
         return
     try:
-        t0 = datetime.now().timestamp()
-        await asyncio.to_thread(
-            _ffmpeg_decode_tail,
-            session.cfg.paths.ffmpeg_path,
-            session.webm_path,
-            session.tail_wav_path,
-            10,
-        )
-        _, chunk_text, _ = await asyncio.to_thread(_transcribe_with_session_model, session, session.tail_wav_path)
+        t0 = time.perf_counter()
+        tail_audio = _live_tail_audio(session)
+        if tail_audio is None:
+            tail_audio = await asyncio.to_thread(
+                _ffmpeg_decode_tail,
+                session.cfg.paths.ffmpeg_path,
+                session.webm_path,
+                DICTATION_TAIL_SECONDS,
+            )
+        _, chunk_text, _ = await asyncio.to_thread(_transcribe_with_session_model, session, tail_audio)
         if chunk_text:
             if _normalize_for_compare(chunk_text) == _normalize_for_compare(session.last_chunk_text):
                 return
@@ -805,25 +1120,24 @@ async def _dictation_step(websocket: WebSocket, session: DictationSession) -> No
             session.last_chunk_text = chunk_text
             if delta_text:
                 session.final_text = (session.final_text + " " + delta_text).strip()
-                await websocket.send_json({"type": "partial", "text": delta_text})
-                await websocket.send_json({"type": "final", "text": session.final_text})
-        dt = max(0.001, datetime.now().timestamp() - t0)
-        await websocket.send_json({"type": "stats", "rtf": round(dt / 10.0, 3), "seconds": 10})
+                await _ws_send_json(websocket, {"type": "partial", "text": delta_text})
+                await _ws_send_json(websocket, {"type": "final", "text": session.final_text})
+        dt = max(0.001, time.perf_counter() - t0)
+        await _ws_send_json(websocket, {"type": "stats", "rtf": round(dt / 10.0, 3), "seconds": 10})
     except Exception as exc:
-        await websocket.send_json({"type": "error", "message": f"dictation step failed: {exc}"})
+        await _ws_send_json(websocket, {"type": "error", "message": f"dictation step failed: {exc}"})
 
 
 async def _finalize_dictation_save(session: DictationSession, session_id: str) -> tuple[str, str]:
-    await asyncio.to_thread(
+    full_audio = await asyncio.to_thread(
         _ffmpeg_decode_full,
         session.cfg.paths.ffmpeg_path,
         session.webm_path,
-        session.full_wav_path,
     )
     segments, text_full, info = await asyncio.to_thread(
         _transcribe_with_session_model,
         session,
-        session.full_wav_path,
+        full_audio,
     )
     if session.manual_text_override and session.final_text.strip():
         final_text = session.final_text.strip()
@@ -849,7 +1163,7 @@ async def _finalize_dictation_save(session: DictationSession, session_id: str) -
 
     source_name = f"dictation_{session_id}"
     source_path = session.full_wav_path.with_name(source_name + ".wav")
-    out_dir = export_outputs(
+    exported = export_transcript(
         cfg=session.cfg,
         source_path=source_path,
         transcript_text=final_text,
@@ -865,23 +1179,12 @@ async def _finalize_dictation_save(session: DictationSession, session_id: str) -
     job.stage = "done"
     job.progress = 1.0
     job.message = "Done"
-    job.output_dir = str(out_dir)
-    try:
-        _index_completed_job(job_id, out_dir)
-    except Exception:
-        pass
+    job.output_dir = str(exported.out_dir)
     try:
-        preview = _build_dictation_preview(final_text)
-        add_dictation_history(
-            db_path=INDEX_DB_PATH,
-            job_id=job_id,
-            output_dir=str(out_dir),
-            text_preview=preview,
-            created_at=datetime.now().isoformat(timespec="seconds"),
-        )
+        await asyncio.to_thread(_record_dictation_job, job_id, exported)
     except Exception:
         pass
-    return job_id, str(out_dir)
+    return job_id, str(exported.out_dir)
 
 
 async def _save_dictation_session(
@@ -890,39 +1193,50 @@ async def _save_dictation_session(
     session_id: str,
 ) -> None:
     if session.saved_once:
-        await websocket.send_json({"type": "status", "message": "already saved"})
+        await _ws_send_json(websocket, {"type": "status", "message": "already saved"})
         return
     await _dictation_step(websocket, session)
     if not session.final_text.strip():
-        await websocket.send_json({"type": "error", "message": "nothing to save"})
+        await _ws_send_json(websocket, {"type": "error", "message": "nothing to save"})
         return
     try:
         job_id, output_dir = await _finalize_dictation_save(session, session_id)
         session.saved_once = True
-        await websocket.send_json({"type": "saved", "job_id": job_id, "output_dir": output_dir})
+        await _ws_send_json(websocket, {"type": "saved", "job_id": job_id, "output_dir": output_dir})
     except Exception as exc:
-        await websocket.send_json({"type": "error", "message": f"save failed: {exc}"})
+        await _ws_send_json(websocket, {"type": "error", "message": f"save failed: {exc}"})
+
+
+# Keyed on mtime so an edited index.html is served without restarting the server.
+@lru_cache(maxsize=1)
+def _read_index_html(mtime_ns: int) -> bytes:
+    return (WEB_DIR / "index.html").read_bytes()
 
 
 @app.get("/", response_class=HTMLResponse)
-def index() -> HTMLResponse:
+async def index(request: Request) -> Response:
     html_path = WEB_DIR / "index.html"
-    if not html_path.exists():
+    try:
+        mtime_ns = html_path.stat().st_mtime_ns
+    except OSError:
         return HTMLResponse("<h3>Missing web/index.html</h3>", status_code=500)
-    return HTMLResponse(html_path.read_text(encoding="utf-8"))
+    headers = {"ETag": f'"{mtime_ns:x}"', "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(_read_index_html(mtime_ns), headers=headers)
 
 
 @app.get("/api/jobs")
-def list_jobs() -> JSONResponse:
-    return JSONResponse([asdict(JOBS[jid]) for jid in JOB_ORDER[:20]])
+async def list_jobs() -> JSONResponse:
+    return JSONResponse([_flat_dict(JOBS[jid]) for jid in islice(JOB_ORDER, 20)])
 
 
 @app.get("/api/jobs/{job_id}")
-def get_job(job_id: str) -> JSONResponse:
+async def get_job(job_id: str) -> JSONResponse:
     job = JOBS.get(job_id)
     if not job:
         return JSONResponse({"error": "not found"}, status_code=404)
-    return JSONResponse(asdict(job))
+    return JSONResponse(_flat_dict(job))
 
 
 @app.post("/api/jobs")
@@ -938,20 +1252,15 @@ async def create_job(
     if Path(safe_name).suffix.lower() not in ALLOWED_EXTENSIONS:
         raise HTTPException(status_code=400, detail="Unsupported media extension")
 
-    job_id = uuid.uuid4().hex[:12]
+    job_id = secrets.token_hex(6)
     upload_path = UPLOADS_DIR / f"{job_id}_{safe_name}"
-    bytes_written = 0
+    if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Uploaded file is too large")
 
     try:
-        with upload_path.open("wb") as f:
-            while True:
-                chunk = await file.read(1024 * 1024)
-                if not chunk:
-                    break
-                bytes_written += len(chunk)
-                if bytes_written > MAX_UPLOAD_BYTES:
-                    raise HTTPException(status_code=413, detail="Uploaded file is too large")
-                f.write(chunk)
+        # The body is already spooled by Starlette; copy it off the event loop so
+        # concurrent uploads and other requests are not blocked on disk writes.
+        bytes_written = await asyncio.to_thread(_save_upload, file.file, upload_path)
     except HTTPException:
         if upload_path.exists():
             upload_path.unlink(missing_ok=True)
@@ -963,8 +1272,8 @@ async def create_job(
 
     job = _create_job(profile=profile, filename=safe_name, job_id=job_id)
 
-    asyncio.create_task(run_transcribe_job(job_id, upload_path))
-    return JSONResponse(asdict(job))
+    _spawn_background(run_transcribe_job(job_id, upload_path))
+    return JSONResponse(_flat_dict(job))
 
 
 @app.post("/api/jobs/from-url")
@@ -978,17 +1287,11 @@ async def create_job_from_url(
         raise HTTPException(status_code=400, detail="Invalid URL")
 
     job = _create_job(profile=profile, filename=url)
-    asyncio.create_task(run_download_and_transcribe_job(job.id, url))
-    return JSONResponse(asdict(job))
+    _spawn_background(run_download_and_transcribe_job(job.id, url))
+    return JSONResponse(_flat_dict(job))
 
 
-@app.get("/api/jobs/{job_id}/download/{which}")
-def download_file(job_id: str, which: str):
-    job = JOBS.get(job_id)
-    if not job or not job.output_dir:
-        return JSONResponse({"error": "not ready"}, status_code=404)
-
-    out_dir = Path(job.output_dir)
+def _resolve_download_path(out_dir: Path, which: str) -> Optional[tuple[Path, os.stat_result]]:
     mapping = {
         "note": out_dir / "note.md",
         "txt": out_dir / "transcript.txt",
@@ -1002,49 +1305,83 @@ def download_file(job_id: str, which: str):
     if which == "polish_meta":
         metas = sorted(out_dir.glob("polish_*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
         path = metas[0] if metas else None
-    if not path or not path.exists():
-        return JSONResponse({"error": "file not found"}, status_code=404)
-    return FileResponse(str(path), filename=path.name)
+    if not path:
+        return None
+    # The stat doubles as the existence check and is handed to FileResponse so it does not stat again.
+    try:
+        return path, path.stat()
+    except FileNotFoundError:
+        return None
 
 
-@app.get("/api/jobs/{job_id}/preview")
-def preview(job_id: str) -> JSONResponse:
+@app.get("/api/jobs/{job_id}/download/{which}")
+async def download_file(job_id: str, which: str):
     job = JOBS.get(job_id)
     if not job or not job.output_dir:
         return JSONResponse({"error": "not ready"}, status_code=404)
 
-    out_dir = Path(job.output_dir)
+    resolved = await asyncio.to_thread(_resolve_download_path, Path(job.output_dir), which)
+    if resolved is None:
+        return JSONResponse({"error": "file not found"}, status_code=404)
+    path, stat_result = resolved
+    return FileResponse(
+        str(path),
+        filename=path.name,
+        media_type=DOWNLOAD_MEDIA_TYPES.get(path.suffix),
+        stat_result=stat_result,
+    )
+
+
+def _read_text_prefix(path: Path, max_chars: int) -> str:
+    # UTF-8 needs at most 4 bytes per char; the incremental decoder drops a char cut at the end.
+    with path.open("rb") as f:
+        data = f.read(max_chars * 4)
+    return codecs.getincrementaldecoder("utf-8")().decode(data)[:max_chars]
+
+
+def _read_preview_files(out_dir: Path, full_transcript: bool) -> tuple[str, str, dict]:
     note_path = out_dir / "note.md"
     txt_path = out_dir / "transcript.txt"
     json_path = out_dir / "transcript.json"
-    note = note_path.read_text(encoding="utf-8") if note_path.exists() else ""
-    transcript = txt_path.read_text(encoding="utf-8") if txt_path.exists() else ""
+    note = note_path.read_bytes().decode("utf-8") if note_path.exists() else ""
+    transcript = ""
+    if txt_path.exists():
+        if full_transcript:
+            transcript = txt_path.read_bytes().decode("utf-8")
+        else:
+            transcript = _read_text_prefix(txt_path, PREVIEW_EXCERPT_CHARS)
     payload: dict = {}
     if json_path.exists():
         try:
-            payload = json.loads(json_path.read_text(encoding="utf-8"))
+            payload = _load_json_file(json_path)
         except Exception:
             payload = {}
+    return note, transcript, payload
+
+
+def _build_preview_payload(out_dir: Path, full: bool) -> dict:
+    note, transcript, payload = _read_preview_files(out_dir, full)
 
     meta = payload.get("meta", {}) if isinstance(payload, dict) else {}
     summary_md = str(payload.get("summary") or "").strip() if isinstance(payload, dict) else ""
     summary_status = str(meta.get("summary_status", "unknown"))
     summary_error = str(meta.get("summary_error") or "").strip()
 
-    summary_section = _extract_markdown_section(summary_md, "summary")
+    sections = _extract_markdown_sections(summary_md)
+    summary_section = sections.get("summary", "")
     if not summary_section and summary_md:
         summary_section = summary_md.strip()
     summary_points = _extract_bullets(summary_section)
     summary_text = summary_section if not summary_points else ""
 
-    action_section = _extract_markdown_section(summary_md, "action items")
+    action_section = sections.get("action items", "")
     action_items = _extract_bullets(action_section)
 
-    transcript_excerpt = transcript[:6000].strip()
+    transcript_excerpt = transcript[:PREVIEW_EXCERPT_CHARS].strip()
 
     preview_payload = {
         "note_md": note,
-        "transcript": transcript,
+        "transcript": transcript if full else "",
         "summary_status": summary_status,
         "summary_error": summary_error,
         "summary_points": summary_points,
@@ -1061,6 +1398,39 @@ def preview(job_id: str) -> JSONResponse:
             "language": meta.get("language", ""),
         },
     }
+    return preview_payload
+
+
+def _file_stamp(path: Path) -> Optional[tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+# Keyed on (mtime, size) of every preview file, so a re-export or deletion misses the cache.
+@lru_cache(maxsize=64)
+def _cached_preview_payload(out_dir_str: str, stamps: tuple) -> dict:
+    return _build_preview_payload(Path(out_dir_str), False)
+
+
+def _load_preview_payload(out_dir: Path, full: bool) -> dict:
+    # UI polling repeats the same preview; ?full=1 responses are too large to keep around.
+    if full:
+        return _build_preview_payload(out_dir, True)
+    stamps = tuple(_file_stamp(out_dir / name) for name in ("note.md", "transcript.txt", "transcript.json"))
+    return _cached_preview_payload(str(out_dir), stamps)
+
+
+@app.get("/api/jobs/{job_id}/preview")
+async def preview(job_id: str, full: bool = Query(False)) -> JSONResponse:
+    job = JOBS.get(job_id)
+    if not job or not job.output_dir:
+        return JSONResponse({"error": "not ready"}, status_code=404)
+
+    # Only the excerpt is read by default; ?full=1 (or /download/txt) returns the whole transcript.
+    preview_payload = await asyncio.to_thread(_load_preview_payload, Path(job.output_dir), full)
     return JSONResponse(preview_payload)
 
 
@@ -1078,18 +1448,17 @@ async def ask_recording(
     if not job or not job.output_dir:
         raise HTTPException(status_code=404, detail="Job not found or not ready")
 
-    sources = search_chunks(INDEX_DB_PATH, question=question, job_id=job_id, limit=limit)
+    sources = await asyncio.to_thread(search_chunks, INDEX_DB_PATH, question=question, job_id=job_id, limit=limit)
     if not sources:
         return JSONResponse({"answer": "В записи этого нет.", "sources": []})
 
     source_blocks = _build_sources_text(sources)
-    if not QA_PROMPT_PATH.exists():
-        raise HTTPException(status_code=500, detail=f"Missing prompt template: {QA_PROMPT_PATH}")
-    template = QA_PROMPT_PATH.read_text(encoding="utf-8")
+    # Same mtime-keyed cache as the polish prompts: one stat per request, no re-read.
+    template = _read_prompt_file(QA_PROMPT_PATH)
     prompt = template.format(question=question, sources=source_blocks)
 
     cfg = load_config("config.ini", init_if_missing=True)
-    healthy, reason = check_ollama_health(cfg)
+    healthy, reason = await asyncio.to_thread(check_ollama_health, cfg)
     if not healthy:
         raise HTTPException(
             status_code=_ollama_error_status(reason),
@@ -1115,9 +1484,10 @@ async def ask_recording(
         {"number": i + 1, "chunk_id": hit.chunk_id, "text": _short_source_text(hit.text)}
         for i, hit in enumerate(sources)
     ]
-    created_at = datetime.now().isoformat(timespec="seconds")
+    created_at = _now_iso()
     try:
-        add_qa_history(
+        await asyncio.to_thread(
+            add_qa_history,
             db_path=INDEX_DB_PATH,
             job_id=job_id,
             question=question,
@@ -1131,11 +1501,11 @@ async def ask_recording(
 
 
 @app.get("/api/search")
-def search_history(
+async def search_history(
     q: str = Query(..., min_length=2),
     limit: int = Query(12, ge=1, le=30),
 ) -> JSONResponse:
-    hits = search_global_chunks(INDEX_DB_PATH, question=q, limit=limit)
+    hits = await asyncio.to_thread(search_global_chunks, INDEX_DB_PATH, question=q, limit=limit)
     items = [
         {
             "job_id": hit.job_id,
@@ -1143,7 +1513,7 @@ def search_history(
             "created_at": hit.created_at,
             "chunk_id": hit.chunk_id,
             "chunk_index": hit.chunk_index,
-            "snippet": _short_source_text(hit.text, max_chars=280),
+            "snippet": hit.snippet,
             "output_dir": hit.output_dir,
         }
         for hit in hits
@@ -1151,92 +1521,77 @@ def search_history(
     return JSONResponse({"query": q, "items": items})
 
 
+def _json_items_response(items_json: str) -> Response:
+    # items_json is already a serialized JSON array (built by SQLite); only wrap it.
+    return Response(content=b'{"items":' + items_json.encode("utf-8") + b"}", media_type="application/json")
+
+
 @app.get("/api/qa/history")
-def get_qa_history(limit: int = Query(50, ge=1, le=200)) -> JSONResponse:
-    history = list_qa_history(INDEX_DB_PATH, limit=limit)
-    items = [
-        {
-            "id": item.id,
-            "job_id": item.job_id,
-            "question": item.question,
-            "answer": item.answer,
-            "created_at": item.created_at,
-        }
-        for item in history
-    ]
-    return JSONResponse({"items": items})
+async def get_qa_history(limit: int = Query(50, ge=1, le=200)) -> Response:
+    items_json = await asyncio.to_thread(list_qa_history_json, INDEX_DB_PATH, limit=limit)
+    return _json_items_response(items_json)
 
 
 @app.get("/api/dictation/history")
-def get_dictation_history(limit: int = Query(50, ge=1, le=200)) -> JSONResponse:
-    history = list_dictation_history(INDEX_DB_PATH, limit=limit)
-    items = [
-        {
-            "id": item.id,
-            "job_id": item.job_id,
-            "output_dir": item.output_dir,
-            "text_preview": item.text_preview,
-            "created_at": item.created_at,
-        }
-        for item in history
-    ]
-    return JSONResponse({"items": items})
+async def get_dictation_history(limit: int = Query(50, ge=1, le=200)) -> Response:
+    items_json = await asyncio.to_thread(list_dictation_history_json, INDEX_DB_PATH, limit=limit)
+    return _json_items_response(items_json)
 
 
 @app.get("/api/transcription/history")
-def get_transcription_history(limit: int = Query(50, ge=1, le=300)) -> JSONResponse:
-    history = list_transcription_history(INDEX_DB_PATH, limit=limit)
-    items = [
-        {
-            "id": item.id,
-            "job_id": item.job_id,
-            "source_name": item.source_name,
-            "title": item.title,
-            "output_dir": item.output_dir,
-            "created_at": item.created_at,
-        }
-        for item in history
-    ]
-    return JSONResponse({"items": items})
+async def get_transcription_history(limit: int = Query(50, ge=1, le=300)) -> Response:
+    items_json = await asyncio.to_thread(list_transcription_history_json, INDEX_DB_PATH, limit=limit)
+    return _json_items_response(items_json)
 
 
 @app.get("/api/transcription/history/{job_id}/zip")
 def download_transcription_zip(job_id: str):
-    history = list_transcription_history(INDEX_DB_PATH, limit=300)
-    hit = next((x for x in history if x.job_id == job_id), None)
+    hit = get_transcription_history_by_job(INDEX_DB_PATH, job_id)
     if hit is None:
         return JSONResponse({"error": "not found"}, status_code=404)
 
     out_dir = Path(hit.output_dir)
     try:
-        payload = _build_transcription_zip(out_dir)
+        archive = _build_transcription_zip(out_dir)
     except FileNotFoundError:
         return JSONResponse({"error": "note.md or transcript.txt not found"}, status_code=404)
 
     meta = _read_transcript_meta(out_dir)
     title = str(meta.get("title") or hit.title or hit.source_name or "transcription").strip()
     ts_raw = str(meta.get("created_at") or hit.created_at or "").strip()
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    ts = _now_stamp()
     if ts_raw:
-        ts = re.sub(r"[^0-9]", "", ts_raw)[:14] or ts
+        ts = _NON_DIGIT_RE.sub("", ts_raw)[:14] or ts
     filename = f"{_safe_slug(title)}_{ts}.zip"
-    headers = {"Content-Disposition": _build_content_disposition(filename)}
-    return StreamingResponse(io.BytesIO(payload), media_type="application/zip", headers=headers)
+    archive.seek(0, os.SEEK_END)
+    size = archive.tell()
+    archive.seek(0)
+    headers = {
+        "Content-Disposition": _build_content_disposition(filename),
+        "Content-Length": str(size),
+    }
+    return StreamingResponse(_iter_file_chunks(archive), media_type="application/zip", headers=headers)
+
+
+def _remove_output_dir(out_dir: Path) -> bool:
+    # False means the path lies outside OUTPUT_DIR and was left alone.
+    # The candidate is still resolved so a symlinked component cannot escape the guard.
+    out_resolved = out_dir.resolve()
+    if out_resolved != OUTPUT_DIR_RESOLVED and out_resolved.is_relative_to(OUTPUT_DIR_RESOLVED):
+        shutil.rmtree(out_resolved, ignore_errors=False)
+        return True
+    return not out_resolved.exists()
 
 
 @app.delete("/api/transcription/history/{item_id}")
-def delete_transcription_history(item_id: int) -> JSONResponse:
-    item = get_transcription_history_item(INDEX_DB_PATH, int(item_id))
+async def delete_transcription_history(item_id: int) -> JSONResponse:
+    item = await asyncio.to_thread(get_transcription_history_item, INDEX_DB_PATH, int(item_id))
     if item is None:
         return JSONResponse({"error": "not found"}, status_code=404)
 
-    out_dir = Path(item.output_dir)
     try:
-        out_resolved = out_dir.resolve()
-        base_resolved = OUTPUT_DIR.resolve()
-        if out_resolved != base_resolved and base_resolved in out_resolved.parents:
-            shutil.rmtree(out_resolved, ignore_errors=False)
-        elif out_resolved.exists():
+        # rmtree walks and unlinks every artifact; keep it off the event loop.
+        if not await asyncio.to_thread(_remove_output_dir, Path(item.output_dir)):
             return JSONResponse({"error": "refuse to delete outside output dir"}, status_code=400)
     except FileNotFoundError:
         pass
@@ -1244,10 +1599,10 @@ def delete_transcription_history(item_id: int) -> JSONResponse:
         return JSONResponse({"error": f"failed to delete files: {exc}"}, status_code=500)
 
     try:
-        delete_index_for_job(INDEX_DB_PATH, item.job_id)
+        await asyncio.to_thread(delete_index_for_job, INDEX_DB_PATH, item.job_id)
     except Exception:
         pass
-    deleted = delete_transcription_history_item(INDEX_DB_PATH, int(item_id))
+    deleted = await asyncio.to_thread(delete_transcription_history_item, INDEX_DB_PATH, int(item_id))
     if not deleted:
         return JSONResponse({"error": "not found"}, status_code=404)
     return JSONResponse({"deleted": True, "id": int(item_id), "job_id": item.job_id})
@@ -1262,8 +1617,10 @@ def delete_dictation_history(item_id: int) -> JSONResponse:
 
 
 @app.get("/api/ollama/models")
-def get_ollama_models() -> JSONResponse:
+def get_ollama_models(refresh: bool = Query(False)) -> JSONResponse:
     cfg = load_config("config.ini", init_if_missing=True)
+    if refresh:
+        refresh_ollama_tags()
     try:
         items = list_ollama_models_detailed(cfg)
         models = [str(item.get("name") or "").strip() for item in items if str(item.get("name") or "").strip()]
@@ -1302,7 +1659,7 @@ async def start_ollama_pull(request: Request) -> JSONResponse:
     if not model:
         raise HTTPException(status_code=400, detail="Model is required")
 
-    pull_id = uuid.uuid4().hex[:12]
+    pull_id = secrets.token_hex(6)
     state = PullState(
         id=pull_id,
         model=model,
@@ -1316,19 +1673,24 @@ async def start_ollama_pull(request: Request) -> JSONResponse:
     async def _runner() -> None:
         cfg = load_config("config.ini", init_if_missing=True)
         cfg.summarize.model = model
-        try:
-            await asyncio.to_thread(
-                ensure_model_available,
-                cfg,
-                model,
-                900,
-                lambda msg: _set_pull_message(pull_id, str(msg)),
-            )
-            _set_pull_done(pull_id, "done")
-        except Exception as exc:
-            _set_pull_error(pull_id, str(exc))
+        loop = asyncio.get_running_loop()
+        if OLLAMA_PULL_SEMAPHORE.locked():
+            _set_pull_message(pull_id, "queued")
+        async with OLLAMA_PULL_SEMAPHORE:
+            try:
+                # Progress arrives on the worker thread; apply it on the loop so watchers can be woken.
+                await asyncio.to_thread(
+                    ensure_model_available,
+                    cfg,
+                    model,
+                    900,
+                    lambda msg: loop.call_soon_threadsafe(_set_pull_message, pull_id, str(msg)),
+                )
+                _set_pull_done(pull_id, "done")
+            except Exception as exc:
+                _set_pull_error(pull_id, str(exc))
 
-    asyncio.create_task(_runner())
+    _spawn_background(_runner())
     return JSONResponse({"ok": True, "pull_id": pull_id, "model": model})
 
 
@@ -1337,7 +1699,50 @@ def get_ollama_pull_status(pull_id: str) -> JSONResponse:
     state = OLLAMA_PULLS.get(pull_id)
     if not state:
         return JSONResponse({"error": "not found"}, status_code=404)
-    return JSONResponse(asdict(state))
+    return JSONResponse(_flat_dict(state))
+
+
+def _sse_data(payload: Any) -> bytes:
+    # SSE data must stay on one line, so no indentation here (unlike _dump_json).
+    if orjson is not None:
+        body = orjson.dumps(payload)
+    else:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    return b"data: " + body + b"\n\n"
+
+
+async def _pull_events(pull_id: str) -> AsyncIterator[bytes]:
+    changed = asyncio.Event()
+    watchers = OLLAMA_PULL_WATCHERS.setdefault(pull_id, [])
+    watchers.append(changed)
+    try:
+        while True:
+            # Cleared before the snapshot so an update during the send is not lost.
+            changed.clear()
+            state = OLLAMA_PULLS.get(pull_id)
+            if state is None:
+                return
+            yield _sse_data(_flat_dict(state))
+            if state.done:
+                return
+            while True:
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=PULL_EVENTS_KEEPALIVE_S)
+                    break
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+    finally:
+        watchers.remove(changed)
+        if not watchers:
+            OLLAMA_PULL_WATCHERS.pop(pull_id, None)
+
+
+@app.get("/api/ollama/pull/{pull_id}/events")
+def stream_ollama_pull_status(pull_id: str):
+    if pull_id not in OLLAMA_PULLS:
+        return JSONResponse({"error": "not found"}, status_code=404)
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(_pull_events(pull_id), media_type="text/event-stream", headers=headers)
 
 
 @app.get("/api/polish/presets")
@@ -1356,9 +1761,8 @@ async def polish_text(request: Request) -> JSONResponse:
     save_as_file = _to_bool(payload.get("save_as_file"), False)
     model_override = str(payload.get("ollama_model") or "").strip()
 
-    preset_files = _discover_polish_preset_files()
-    preset_path = preset_files.get(preset)
-    if preset_path is None:
+    preset_cfg = _discover_polish_presets().get(preset)
+    if preset_cfg is None:
         raise HTTPException(status_code=400, detail=f"Unsupported preset: {preset}")
     if not source_text:
         raise HTTPException(status_code=400, detail="Text is empty")
@@ -1368,7 +1772,7 @@ async def polish_text(request: Request) -> JSONResponse:
     cfg = load_config("config.ini", init_if_missing=True)
     if model_override:
         cfg.summarize.model = model_override
-    healthy, reason = check_ollama_health(cfg)
+    healthy, reason = await asyncio.to_thread(check_ollama_health, cfg)
     if not healthy:
         status_code = _ollama_error_status(reason)
         return JSONResponse(
@@ -1378,12 +1782,12 @@ async def polish_text(request: Request) -> JSONResponse:
 
     prompt = _build_polish_prompt(
         preset=preset,
-        preset_path=preset_path,
+        preset_path=preset_cfg.path,
         text=source_text,
         instruction=instruction,
         strict=strict,
     )
-    num_predict = POLISH_NUM_PREDICT.get(preset, 350)
+    num_predict = preset_cfg.num_predict
 
     try:
         polished_text = await asyncio.to_thread(
@@ -1434,7 +1838,7 @@ async def polish_text(request: Request) -> JSONResponse:
 @app.websocket("/ws/dictation")
 async def ws_dictation(websocket: WebSocket) -> None:
     await websocket.accept()
-    session_id = uuid.uuid4().hex[:16]
+    session_id = secrets.token_hex(8)
     DICTATION_SESSIONS.pop(session_id, None)
     session: Optional[DictationSession] = None
 
@@ -1449,7 +1853,7 @@ async def ws_dictation(websocket: WebSocket) -> None:
             session.worker = None
 
     try:
-        await websocket.send_json({"type": "status", "message": "connected", "session_id": session_id})
+        await _ws_send_json(websocket, {"type": "status", "message": "connected", "session_id": session_id})
         while True:
             message = await websocket.receive()
             msg_type = message.get("type")
@@ -1458,9 +1862,10 @@ async def ws_dictation(websocket: WebSocket) -> None:
                 break
 
             if message.get("bytes") is not None:
-                if session and session.running:
-                    with session.webm_path.open("ab") as f:
-                        f.write(message["bytes"])
+                if session and session.running and session.webm_file is not None:
+                    await asyncio.to_thread(session.webm_file.write, message["bytes"])
+                    await _feed_dictation_decoder(session, message["bytes"])
+                    session.audio_ready.set()
                 continue
 
             text = message.get("text")
@@ -1468,16 +1873,16 @@ async def ws_dictation(websocket: WebSocket) -> None:
                 continue
 
             try:
-                payload = json.loads(text)
+                payload = _loads_json(text)
             except Exception:
-                await websocket.send_json({"type": "error", "message": "invalid json command"})
+                await _ws_send_json(websocket, {"type": "error", "message": "invalid json command"})
                 continue
 
             command = str(payload.get("type", "")).strip().lower()
 
             if command == "start":
                 if session and session.running:
-                    await websocket.send_json({"type": "status", "message": "already running"})
+                    await _ws_send_json(websocket, {"type": "status", "message": "already running"})
                     continue
 
                 base_cfg = load_config("config.ini", init_if_missing=True)
@@ -1489,12 +1894,14 @@ async def ws_dictation(websocket: WebSocket) -> None:
                 summarize_enabled = bool(payload.get("summarize", default_summarize))
                 source_mime = str(payload.get("mime_type", "")).strip()
 
+                if session:
+                    await _stop_dictation_decoder(session)
+                    _close_webm_file(session)
                 cfg = _build_cfg_for_dictation(profile=profile, language=language, summarize_enabled=summarize_enabled)
                 model, model_device, model_compute_type = await asyncio.to_thread(_init_dictation_model, cfg)
 
                 base = DICTATION_DIR / session_id
                 webm_path = base.with_suffix(".webm")
-                tail_wav_path = base.with_name(base.name + "_tail.wav")
                 full_wav_path = base.with_name(base.name + "_full.wav")
                 webm_path.write_bytes(b"")
 
@@ -1506,7 +1913,6 @@ async def ws_dictation(websocket: WebSocket) -> None:
                     summarize_enabled=summarize_enabled,
                     source_mime=source_mime,
                     webm_path=webm_path,
-                    tail_wav_path=tail_wav_path,
                     full_wav_path=full_wav_path,
                     running=True,
                     final_text="",
@@ -1517,10 +1923,17 @@ async def ws_dictation(websocket: WebSocket) -> None:
                     manual_text_override=False,
                     saved_once=False,
                     worker=None,
+                    audio_ready=asyncio.Event(),
+                    decoder=None,
+                    decoder_pump=None,
+                    pcm_tail=bytearray(),
+                    webm_file=webm_path.open("ab", buffering=0),
                 )
+                await _start_dictation_decoder(session)
                 session.worker = asyncio.create_task(_dictation_worker(websocket, session_id))
                 DICTATION_SESSIONS[session_id] = session
-                await websocket.send_json(
+                await _ws_send_json(
+                    websocket,
                     {
                         "type": "started",
                         "session_id": session_id,
@@ -1528,18 +1941,20 @@ async def ws_dictation(websocket: WebSocket) -> None:
                         "language": language,
                         "device": model_device,
                         "model": cfg.stt.model_name,
-                    }
+                    },
                 )
-                await websocket.send_json({"type": "state", "state": "recording"})
+                await _ws_send_json(websocket, {"type": "state", "state": "recording"})
                 continue
 
             if command == "stop":
                 await stop_worker()
                 if session:
                     await _dictation_step(websocket, session)
-                    await websocket.send_json({"type": "final", "text": session.final_text})
-                    await websocket.send_json({"type": "stopped"})
-                    await websocket.send_json({"type": "state", "state": "stopped"})
+                    await _stop_dictation_decoder(session)
+                    _close_webm_file(session)
+                    await _ws_send_json(websocket, {"type": "final", "text": session.final_text})
+                    await _ws_send_json(websocket, {"type": "stopped"})
+                    await _ws_send_json(websocket, {"type": "state", "state": "stopped"})
                     if session.cfg.dictation.auto_save:
                         await _save_dictation_session(websocket, session, session_id)
                 continue
@@ -1554,24 +1969,27 @@ async def ws_dictation(websocket: WebSocket) -> None:
                     session.final_text = ""
                     session.manual_text_override = False
                     session.saved_once = False
-                    if session.webm_path.exists():
+                    if session.webm_file is not None:
+                        session.webm_file.truncate(0)
+                    elif session.webm_path.exists():
                         session.webm_path.write_bytes(b"")
-                    await websocket.send_json({"type": "final", "text": ""})
+                    session.pcm_tail.clear()
+                    await _ws_send_json(websocket, {"type": "final", "text": ""})
                 continue
 
             if command == "set_text":
                 if not session:
-                    await websocket.send_json({"type": "error", "message": "dictation not started"})
+                    await _ws_send_json(websocket, {"type": "error", "message": "dictation not started"})
                     continue
                 incoming = str(payload.get("text", "")).strip()
                 session.final_text = incoming
                 session.manual_text_override = bool(incoming)
-                await websocket.send_json({"type": "final", "text": session.final_text})
+                await _ws_send_json(websocket, {"type": "final", "text": session.final_text})
                 continue
 
             if command == "save":
                 if not session:
-                    await websocket.send_json({"type": "error", "message": "dictation not started"})
+                    await _ws_send_json(websocket, {"type": "error", "message": "dictation not started"})
                     continue
                 incoming = str(payload.get("text_override", "")).strip()
                 if incoming:
@@ -1581,97 +1999,69 @@ async def ws_dictation(websocket: WebSocket) -> None:
                 await _save_dictation_session(websocket, session, session_id)
                 continue
 
-            await websocket.send_json({"type": "error", "message": f"unknown command: {command}"})
+            await _ws_send_json(websocket, {"type": "error", "message": f"unknown command: {command}"})
     except WebSocketDisconnect:
         pass
     finally:
         await stop_worker()
         if session:
-            for path in (session.tail_wav_path, session.full_wav_path):
-                try:
-                    path.unlink(missing_ok=True)
-                except Exception:
-                    pass
+            await _stop_dictation_decoder(session)
+            _close_webm_file(session)
         DICTATION_SESSIONS.pop(session_id, None)
 
 
+@lru_cache(maxsize=1)
+def _pipeline_logger(log_file: Path) -> logging.Logger:
+    # Configured once per process, not per job: setup_logging replaces the handlers.
+    return setup_logging(log_file)
+
+
+def _run_pipeline_job(input_path: Path, profile: str, on_stage: Any) -> ExportedTranscript:
+    cfg = load_config(str(APP_DIR / "config.ini"), init_if_missing=True)
+    apply_profile_override(cfg, profile)
+    _pipeline_logger(cfg.paths.logs_dir / "transcribelite.log")
+    return transcribe_media(cfg, input_path, on_stage=on_stage)
+
+
 async def run_transcribe_job(job_id: str, input_path: Path) -> None:
     job = JOBS[job_id]
-    started_at = datetime.now().timestamp()
+    if TRANSCRIBE_SEMAPHORE.locked():
+        job.status = "queued"
+        job.stage = "queued"
+        job.message = "Waiting for another job to finish..."
+    async with TRANSCRIBE_SEMAPHORE:
+        await _run_transcribe_job(job_id, input_path)
+
+
+async def _run_transcribe_job(job_id: str, input_path: Path) -> None:
+    job = JOBS[job_id]
     job.status = "running"
     job.stage = "ingest"
     job.progress = 0.05
     job.message = "Starting..."
 
-    cmd = [
-        _resolve_python_executable(),
-        "-m",
-        "transcribelite.app",
-        "--config",
-        "config.ini",
-        "transcribe",
-        str(input_path),
-        "--profile",
-        job.profile,
-    ]
+    loop = asyncio.get_running_loop()
+    stage_done: set[str] = set()
+
+    def _apply_stage(stage: str, seconds: float) -> None:
+        stage_done.add(stage)
+        job.stage = stage
+        job.message = f"{stage}: {seconds:.1f}s"
+        job.progress = min(0.95, sum(w for name, w in STAGE_WEIGHTS.items() if name in stage_done) + 0.02)
 
     try:
-        proc = await asyncio.create_subprocess_exec(
-            *cmd,
-            cwd=str(APP_DIR),
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.STDOUT,
+        # In-process, so Whisper models stay cached across jobs; stage reports hop back onto the loop.
+        exported = await asyncio.to_thread(
+            _run_pipeline_job,
+            input_path,
+            job.profile,
+            lambda stage, seconds: loop.call_soon_threadsafe(_apply_stage, stage, seconds),
         )
-
-        stage_weights = {"download": 0.10, "ingest": 0.08, "stt": 0.62, "summarize": 0.15, "export": 0.05}
-        stage_done: set[str] = set()
-
-        assert proc.stdout is not None
-        async for raw in proc.stdout:
-            line = raw.decode("utf-8", errors="ignore").rstrip()
-            if line:
-                job.message = line
-
-            stage_match = STAGE_RE.match(line)
-            if stage_match:
-                stage = stage_match.group(1).lower()
-                stage_done.add(stage)
-                progress = sum(weight for stage_name, weight in stage_weights.items() if stage_name in stage_done)
-                job.stage = stage
-                job.progress = min(0.95, progress + 0.02)
-
-            done_match = DONE_RE.search(line)
-            if done_match:
-                out_path = done_match.group(2).strip()
-                job.output_dir = out_path
-
-        rc = await proc.wait()
-        if rc != 0:
-            raise RuntimeError(f"CLI failed with code {rc}")
-
-        if not job.output_dir:
-            job.output_dir = _find_output_for_input(input_path, started_at)
-        if job.output_dir:
-            out_dir = Path(job.output_dir)
-            try:
-                await asyncio.to_thread(_index_completed_job, job_id, out_dir)
-            except Exception:
-                pass
-            try:
-                created_at = datetime.now().isoformat(timespec="seconds")
-                meta = _read_transcript_meta(out_dir)
-                title = str(meta.get("title") or Path(job.filename).stem).strip()
-                await asyncio.to_thread(
-                    add_transcription_history,
-                    INDEX_DB_PATH,
-                    job_id,
-                    Path(job.filename).name,
-                    title,
-                    str(out_dir),
-                    created_at,
-                )
-            except Exception:
-                pass
+        job.output_dir = str(exported.out_dir)
+        try:
+            await asyncio.to_thread(_record_transcription_job, job_id, exported, job.filename)
+        except Exception:
+            pass
 
         job.status = "done"
         job.stage = "done"
@@ -1690,7 +2080,11 @@ async def run_transcribe_job(job_id: str, input_path: Path) -> None:
             pass
 
 
-def _download_media_via_ytdlp(url: str, target_prefix: Path) -> Path:
+def _download_media_via_ytdlp(
+    url: str,
+    target_prefix: Path,
+    progress_cb: Optional[Callable[[float], None]] = None,
+) -> Path:
     try:
         import yt_dlp  # type: ignore
     except Exception as exc:
@@ -1706,6 +2100,21 @@ def _download_media_via_ytdlp(url: str, target_prefix: Path) -> Path:
         if isinstance(duration, (int, float)) and duration > MAX_REMOTE_DURATION_SECONDS:
             raise RuntimeError("Remote media is too long (over 3 hours)")
 
+    last_percent = -1
+
+    def _on_progress(d: Dict[str, Any]) -> None:
+        nonlocal last_percent
+        if progress_cb is None or d.get("status") != "downloading":
+            return
+        total = d.get("total_bytes") or d.get("total_bytes_estimate")
+        if not total:
+            return
+        # The hook fires per block; only whole-percent changes are forwarded.
+        percent = min(100, int(100 * (d.get("downloaded_bytes") or 0) / total))
+        if percent != last_percent:
+            last_percent = percent
+            progress_cb(percent / 100.0)
+
     outtmpl = str(target_prefix) + ".%(ext)s"
     dl_opts = {
         "format": "bestaudio/best",
@@ -1714,19 +2123,27 @@ def _download_media_via_ytdlp(url: str, target_prefix: Path) -> Path:
         "no_warnings": True,
         "noplaylist": True,
         "max_filesize": MAX_REMOTE_DOWNLOAD_BYTES,
+        "progress_hooks": [_on_progress],
     }
     with yt_dlp.YoutubeDL(dl_opts) as ydl:
         ydl.download([url])
 
-    candidates = sorted(target_prefix.parent.glob(target_prefix.name + ".*"), key=lambda p: p.stat().st_mtime, reverse=True)
+    # Normally exactly one match, so only stat when there is something to choose between.
+    prefix = target_prefix.name + "."
+    with os.scandir(target_prefix.parent) as it:
+        candidates = [entry for entry in it if entry.name.startswith(prefix) and entry.is_file()]
     if not candidates:
         raise RuntimeError("Download finished but file was not found")
-    downloaded = candidates[0]
-    if downloaded.stat().st_size > MAX_REMOTE_DOWNLOAD_BYTES:
+    if len(candidates) == 1:
+        chosen = candidates[0]
+    else:
+        chosen = max(candidates, key=lambda entry: entry.stat().st_mtime_ns)
+    downloaded = Path(chosen.path)
+    if chosen.stat().st_size > MAX_REMOTE_DOWNLOAD_BYTES:
         downloaded.unlink(missing_ok=True)
         raise RuntimeError("Downloaded file exceeds size limit")
 
-    safe_title = re.sub(r"[^a-zA-Z0-9._-]+", "_", title).strip("_")
+    safe_title = _ASCII_FNAME_UNSAFE_RE.sub("_", title).strip("_")
     if safe_title:
         desired = downloaded.with_name(f"{target_prefix.name}_{safe_title}{downloaded.suffix}")
         if desired != downloaded:
@@ -1742,9 +2159,22 @@ async def run_download_and_transcribe_job(job_id: str, url: str) -> None:
     job.progress = 0.03
     job.message = "Downloading media..."
 
+    loop = asyncio.get_running_loop()
+
+    def _apply_download_progress(fraction: float) -> None:
+        if job.stage != "download":
+            return
+        job.progress = 0.03 + 0.02 * fraction
+        job.message = f"Downloading media... {fraction:.0%}"
+
     target_prefix = UPLOADS_DIR / f"{job_id}_url"
     try:
-        downloaded = await asyncio.to_thread(_download_media_via_ytdlp, url, target_prefix)
+        downloaded = await asyncio.to_thread(
+            _download_media_via_ytdlp,
+            url,
+            target_prefix,
+            lambda fraction: loop.call_soon_threadsafe(_apply_download_progress, fraction),
+        )
         job.filename = downloaded.name
         job.stage = "ingest"
         job.progress = 0.05
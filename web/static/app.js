@@ -327,11 +327,12 @@ async function loadPolishPresets() {
   updatePolishInstructionPlaceholder();
 }
 
-async function loadPolishModels() {
+async function loadPolishModels(refresh = false) {
   const select = $("polishModel");
   const previous = select.value;
   select.innerHTML = "";
-  const response = await fetch("/api/ollama/models");
+  // The server caches the tag list; only an explicit refresh bypasses it.
+  const response = await fetch(refresh ? "/api/ollama/models?refresh=1" : "/api/ollama/models");
   const payload = await response.json();
   ollamaCloudKeyEnv = payload.cloud_key_env || "OLLAMA_API_KEY";
   ollamaCloudKeyMissing = Boolean(payload.cloud_key_missing);
@@ -414,19 +415,24 @@ async function ensurePolishModel(model) {
     throw new Error(startPayload.detail || startPayload.error || "Не удалось начать загрузку модели");
   }
   const pullId = startPayload.pull_id;
-  while (true) {
-    await new Promise((resolve) => setTimeout(resolve, 850));
-    const statusResponse = await fetch(`/api/ollama/pull/${pullId}`);
-    const statusPayload = await statusResponse.json();
-    if (!statusResponse.ok) throw new Error(statusPayload.detail || statusPayload.error || "Ошибка проверки загрузки модели");
-    $("polishHint").textContent = `Загрузка модели: ${statusPayload.message || "..."}`;
-    if (statusPayload.done) {
+  await new Promise((resolve, reject) => {
+    const events = new EventSource(`/api/ollama/pull/${pullId}/events`);
+    events.onmessage = (event) => {
+      const statusPayload = JSON.parse(event.data);
+      $("polishHint").textContent = `Загрузка модели: ${statusPayload.message || "..."}`;
+      if (!statusPayload.done) return;
+      events.close();
       if (statusPayload.status === "error") {
-        throw new Error(statusPayload.error || "Загрузка модели завершилась ошибкой");
+        reject(new Error(statusPayload.error || "Загрузка модели завершилась ошибкой"));
+      } else {
+        resolve();
       }
-      break;
-    }
-  }
+    };
+    events.onerror = () => {
+      events.close();
+      reject(new Error("Ошибка проверки загрузки модели"));
+    };
+  });
   await loadPolishModels();
   return true;
 }
@@ -1144,6 +1150,7 @@ function initControls() {
   $("dictCopy").addEventListener("click", copyDictationText);
   $("polishFromDictation").addEventListener("click", openPolishModal);
   $("polishClose").addEventListener("click", closePolishModal);
+  $("polishModelsRefresh").addEventListener("click", () => loadPolishModels(true));
   const polishModal = $("polishModal");
   const polishCard = polishModal?.querySelector(".modal-card");
   polishModal?.addEventListener("click", (e) => {